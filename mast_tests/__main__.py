@@ -0,0 +1,5 @@
+import sys
+
+from mast_tests.cli import main
+
+sys.exit(main())
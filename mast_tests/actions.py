@@ -0,0 +1,159 @@
+"""MAST web actions described as data.
+
+Each Action is one form in the web UI: the tab it lives on, the form's
+name, the values the tests fill in and the text expected in the output.
+Engines which don't drive the browser (the HTTP API mode, benchmarks,
+cleaning up after a failed run) work from these.
+"""
+from collections import OrderedDict
+
+
+class Action(object):
+    def __init__(self, tab, form, fields=None, expected=(), hostnames=True,
+                 name=None):
+        self.tab = tab
+        self.form = form
+        self.fields = fields or {}
+        self.expected = list(expected)
+        # Whether every appliance's hostname should appear in the output
+        self.hostnames = hostnames
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name or self.form
+
+    def expected_texts(self, appliances):
+        texts = []
+        if self.hostnames:
+            texts += [appliance["hostname"] for appliance in appliances]
+        return texts + self.expected
+
+    def __repr__(self):
+        return "<Action {}/{}>".format(self.tab, self.form)
+
+
+class SshSession(object):
+    """A scripted ssh session, every command is sent to every appliance and
+    each appliance's transcript must contain the expected text.
+    """
+    tab = "ssh"
+
+    def __init__(self, name, commands, expected=()):
+        self.name = name
+        self.commands = list(commands)
+        self.expected = list(expected)
+
+    def expected_texts(self, appliances):
+        return list(self.expected)
+
+    def __repr__(self):
+        return "<SshSession {}>".format(self.name)
+
+
+# Read-only actions which can be checked against the backend directly
+BACKEND_CHECKS = [
+    Action("system", "get_status",
+           fields={
+               "StatusProvider": ["DateTimeStatus"],
+               "Domain": "default",
+               "no_check_hostname": True,
+           }),
+    Action("system", "list_domains",
+           fields={"no_check_hostname": True},
+           expected=["All", "default"]),
+    Action("system", "get_filestore",
+           fields={
+               "Domain": "default",
+               "location": "pubcert:",
+               "no_check_hostname": True,
+           },
+           expected=["See Download"]),
+    Action("accounts", "list_groups",
+           fields={"no_check_hostname": True},
+           expected=["All"]),
+    Action("accounts", "list_users",
+           fields={"no_check_hostname": True},
+           expected=["All"]),
+    Action("developer", "flush_document_cache",
+           fields={
+               "xml_manager": "default",
+               "Domain": "default",
+               "no_check_hostname": True,
+           },
+           expected=["Succeeded"]),
+    Action("network", "display_routing_table",
+           fields={"no_check_hostname": True},
+           expected=["Appliance", "Destination", "Gateway", "Metric"]),
+]
+
+
+def _by_name(actions, *names):
+    return [action for action in actions if action.name in names]
+
+
+# Actions which are run repeatedly to measure MAST web under load. The
+# backups actions write to the appliances (set checkpoint saves a
+# checkpoint of the default domain every time it runs)
+BENCHMARKS = _by_name(
+    BACKEND_CHECKS, "get_status", "list_domains", "get_filestore"
+) + [
+    Action("backups", "get_normal_backup",
+           fields={
+               "comment": "benchmark",
+               "Domain": ["default"],
+               "no_check_hostname": True,
+           },
+           expected=["Verified"]),
+    Action("backups", "set_checkpoint",
+           fields={
+               "comment": "benchmark",
+               "Domain": ["default"],
+               "no_check_hostname": True,
+           },
+           expected=["Succeeded"]),
+    SshSession("ssh",
+               commands=[
+                   "show clock",
+                   "config",
+                   "switch domain default",
+                   "dir local:///",
+                   "exit",
+                   "exit",
+               ],
+               expected=["show clock", "Goodbye."]),
+]
+
+
+def cleanups(names):
+    """How to remove each resource the tests create, for when the test
+    which would have removed it did not run or did not pass, given the
+    run's Names. Deleting the domain takes the files written into it with
+    it.
+    """
+    return OrderedDict([
+        ("user:demoTest", Action("accounts", "del_user",
+                                 fields={
+                                     "User": names.user,
+                                     "save_config": True,
+                                     "no_check_hostname": True,
+                                 },
+                                 expected=["Succeeded"],
+                                 name="clean up user:demoTest")),
+        ("group:demoRO", Action("accounts", "del_group",
+                                fields={
+                                    "UserGroup": names.group,
+                                    "save_config": True,
+                                    "no_check_hostname": True,
+                                },
+                                expected=["Succeeded"],
+                                name="clean up group:demoRO")),
+        ("domain:demo", Action("system", "del_domain",
+                               fields={
+                                   "Domain": names.domain,
+                                   "save_config": True,
+                                   "no_check_hostname": True,
+                               },
+                               expected=["Succeeded"],
+                               name="clean up domain:demo")),
+    ])
@@ -0,0 +1,139 @@
+"""Check MAST web actions over HTTP without a browser.
+
+Forms are posted the way the web UI posts them: to the tab's endpoint
+with ``callable`` naming the form, the form's fields, and the selected
+appliances as ``appliances[]`` with matching ``credentials[]``. The
+response body is checked for the same text the UI tests look for in the
+output pane.
+
+Configured by the optional "api" section of config.json::
+
+    "api": {
+        "endpoint": "{address}/{tab}",
+        "verify": false,
+        "connections": 10
+    }
+"""
+import logging
+from multiprocessing.pool import ThreadPool
+from time import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from mast_tests.report import recorder
+from mast_tests.runner import Result, PASSED, FAILED
+
+log = logging.getLogger(__name__)
+
+
+class Client(object):
+    """A pooled HTTP session against one MAST web instance."""
+    def __init__(self, address, appliances, timeout=30, endpoint=None,
+                 verify=False, connections=10):
+        self.address = address.rstrip("/")
+        self.appliances = appliances
+        self.timeout = timeout
+        self.endpoint = endpoint or "{address}/{tab}"
+        self.session = requests.Session()
+        self.session.verify = verify
+        adapter = HTTPAdapter(pool_connections=connections,
+                              pool_maxsize=connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not verify:
+            requests.packages.urllib3.disable_warnings()
+
+    def payload(self, form, fields):
+        data = [("callable", form)]
+        for appliance in self.appliances:
+            data.append(("appliances[]", appliance["hostname"]))
+            data.append(("credentials[]", "{}:{}".format(
+                appliance["username"], appliance["password"]
+            )))
+        for name, value in sorted(fields.items()):
+            if isinstance(value, bool):
+                if value:
+                    data.append((name, "true"))
+            elif isinstance(value, (list, tuple)):
+                data.extend((name, v) for v in value)
+            else:
+                data.append((name, value))
+        return data
+
+    def submit(self, tab, form, fields):
+        """Post form and return the response body."""
+        url = self.endpoint.format(address=self.address, tab=tab)
+        response = self.session.post(
+            url, data=self.payload(form, fields), timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.text
+
+    def ssh(self, command, session):
+        """Send command to every appliance in the named ssh session and
+        return a dict of hostname -> output.
+        """
+        url = self.endpoint.format(address=self.address, tab="ssh")
+        data = [("command", command), ("session", session)]
+        data += [pair for pair in self.payload("ssh", {})
+                 if pair[0] != "callable"]
+        response = self.session.post(url, data=data, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+
+def check(client, action):
+    """Submit action and assert its expected text is in the response."""
+    start = time()
+    try:
+        with recorder.test(action.name):
+            with recorder.span("submit"):
+                text = client.submit(action.tab, action.form, action.fields)
+            with recorder.span("assert"):
+                missing = [
+                    expected
+                    for expected in action.expected_texts(client.appliances)
+                    if expected not in text
+                ]
+            if missing:
+                raise AssertionError("{} not found in response".format(
+                    ", ".join(repr(m) for m in missing)
+                ))
+    except Exception as e:
+        duration = time() - start
+        log.error("API check {} failed after {:.3f}s: {}".format(
+            action.name, duration, e
+        ))
+        return Result(action.name, FAILED, duration, e)
+    duration = time() - start
+    log.info("API check {} passed in {:.3f}s".format(action.name, duration))
+    return Result(action.name, PASSED, duration)
+
+
+def clean_up(client, actions, resources):
+    """Run the action in actions (resource -> Action) which removes each of
+    resources in turn, returning a list of Results.
+    """
+    results = []
+    for resource in resources:
+        action = actions.get(resource)
+        if action is None:
+            log.info("Nothing cleans up {}, leaving it".format(resource))
+            continue
+        log.info("Cleaning up {}".format(resource))
+        results.append(check(client, action))
+    return results
+
+
+def run_checks(client, actions, workers=4):
+    """Run every action concurrently, returning a list of Results."""
+    pool = ThreadPool(workers)
+    try:
+        return pool.map(lambda action: check(client, action), actions)
+    finally:
+        pool.close()
+        pool.join()
@@ -0,0 +1,228 @@
+"""Measure how MAST web's response time holds up under load.
+
+Each benchmark action (see ``mast_tests.actions.BENCHMARKS``) is sent over
+HTTP, the same way the API mode sends it, ``iterations`` times by
+``concurrency`` threads at once against the first ``appliances`` appliances
+in config.json. Every combination of the configured concurrency levels and
+appliance counts is measured::
+
+    "benchmark": {
+        "iterations": 20,
+        "concurrency": [1, 4],
+        "appliances": [1, 2],
+        "tolerance": 0.2
+    }
+
+A run can be saved as a named baseline under ``<cache>/benchmarks`` and
+later runs compared against it, anything whose p95 latency grew or whose
+throughput fell by more than ``tolerance`` is reported as a regression.
+"""
+import os
+import json
+import math
+import uuid
+import logging
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+from time import time
+
+from mast_tests.actions import SshSession
+from mast_tests.api import Client
+
+log = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples, p):
+    """The p'th percentile of samples by the nearest-rank method."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = int(math.ceil(p / 100.0 * len(ordered)))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+def summarize(latencies, errors, wall):
+    summary = OrderedDict([
+        ("requests", len(latencies) + errors),
+        ("errors", errors),
+        ("throughput", round(len(latencies) / wall, 3) if wall else None),
+    ])
+    for p in PERCENTILES:
+        value = percentile(latencies, p)
+        summary["p{}".format(p)] = None if value is None else round(value, 4)
+    summary["max"] = round(max(latencies), 4) if latencies else None
+    return summary
+
+
+def _missing(text, expected):
+    return [e for e in expected if e not in text]
+
+
+def perform(client, action):
+    """Run action once, raising AssertionError if its output is wrong."""
+    if isinstance(action, SshSession):
+        session = uuid.uuid4().hex
+        transcripts = {}
+        for command in action.commands:
+            output = client.ssh(command, session)
+            for appliance in client.appliances:
+                hostname = appliance["hostname"]
+                transcripts[hostname] = (
+                    transcripts.get(hostname, "") + output.get(hostname, "")
+                )
+        for hostname, transcript in transcripts.items():
+            missing = _missing(transcript, action.expected_texts([]))
+            if missing:
+                raise AssertionError("{} not found in {} transcript".format(
+                    ", ".join(repr(m) for m in missing), hostname
+                ))
+        return
+    text = client.submit(action.tab, action.form, action.fields)
+    missing = _missing(text, action.expected_texts(client.appliances))
+    if missing:
+        raise AssertionError("{} not found in response".format(
+            ", ".join(repr(m) for m in missing)
+        ))
+
+
+def measure(client, action, iterations, concurrency):
+    """Run action iterations times, concurrency at a time, and summarize
+    the latency of the successful runs. Failures are logged as a warning
+    along with the first of their errors.
+    """
+    errors = []
+
+    def once(_):
+        start = time()
+        try:
+            perform(client, action)
+        except Exception as e:
+            log.debug("Benchmark {} failed: {}".format(action.name, e))
+            errors.append(e)
+            return None
+        return time() - start
+
+    pool = ThreadPool(concurrency)
+    start = time()
+    try:
+        samples = pool.map(once, range(iterations))
+    finally:
+        pool.close()
+        pool.join()
+    wall = time() - start
+    latencies = [s for s in samples if s is not None]
+    if errors:
+        log.warning("Benchmark {} failed {} of {} times, first with "
+                    "{}: {}".format(action.name, len(errors), len(samples),
+                                    type(errors[0]).__name__, errors[0]))
+    return summarize(latencies, len(samples) - len(latencies), wall)
+
+
+def run_benchmarks(address, appliances, actions, iterations=20,
+                   concurrency=(1,), appliance_counts=None, timeout=30,
+                   api=None):
+    """Measure every action at every concurrency level and appliance count
+    and return the results as a dict ready to be saved.
+    """
+    api = dict(api or {})
+    if appliance_counts is None:
+        appliance_counts = [len(appliances)]
+    runs = OrderedDict()
+    for count in appliance_counts:
+        if count > len(appliances):
+            log.warning("Only {} appliances are configured, skipping "
+                        "benchmarks with {}".format(len(appliances), count))
+            continue
+        for level in concurrency:
+            key = "appliances={} concurrency={}".format(count, level)
+            api["connections"] = max(level, api.get("connections", 10))
+            client = Client(address, appliances[:count], timeout=timeout,
+                            **api)
+            results = OrderedDict()
+            try:
+                for action in actions:
+                    results[action.name] = measure(
+                        client, action, iterations, level
+                    )
+                    log.info("Benchmark {} {}: {}".format(
+                        key, action.name, ", ".join(
+                            "{}={}".format(k, v)
+                            for k, v in results[action.name].items()
+                        )
+                    ))
+            finally:
+                client.close()
+            runs[key] = results
+    return OrderedDict([
+        ("created", time()),
+        ("address", address),
+        ("iterations", iterations),
+        ("runs", runs),
+    ])
+
+
+def failures(results):
+    """(run, action, errors) for every action in results which failed at
+    least once.
+    """
+    return [
+        (key, name, summary["errors"])
+        for key, actions in results["runs"].items()
+        for name, summary in actions.items()
+        if summary["errors"]
+    ]
+
+
+def baseline_path(cache, name):
+    return os.path.join(cache, "benchmarks", name + ".json")
+
+
+def save(results, path):
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, "w") as fp:
+        json.dump(results, fp, indent=4)
+    log.info("Saved benchmark results to {}".format(path))
+
+
+def load(path):
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Log how results differ from baseline and return a list of
+    (run, action, description) for each regression beyond tolerance.
+    """
+    regressions = []
+    for key, actions in results["runs"].items():
+        for name, current in actions.items():
+            previous = baseline["runs"].get(key, {}).get(name)
+            if not previous:
+                log.info("Benchmark {} {}: no baseline".format(key, name))
+                continue
+            for metric, worse in (("p95", lambda a, b: a > b * (1 + tolerance)),
+                                  ("throughput",
+                                   lambda a, b: a < b * (1 - tolerance))):
+                now, then = current.get(metric), previous.get(metric)
+                if not now or not then:
+                    continue
+                log.info("Benchmark {} {} {}: {} (baseline {}, {:+.1%})".format(
+                    key, name, metric, now, then, (now - then) / then
+                ))
+                if worse(now, then):
+                    regressions.append((key, name, "{} {} -> {}".format(
+                        metric, then, now
+                    )))
+            if current["errors"] > previous.get("errors", 0):
+                regressions.append((key, name, "errors {} -> {}".format(
+                    previous.get("errors", 0), current["errors"]
+                )))
+    for key, name, description in regressions:
+        log.warning("Benchmark regression {} {}: {}".format(
+            key, name, description
+        ))
+    return regressions
@@ -0,0 +1,205 @@
+"""Start WebDriver sessions from the "browser" section of config.json.
+
+Example::
+
+    "browser": {
+        "name": "firefox",
+        "headless": true,
+        "width": 1920,
+        "height": 1080,
+        "images": false,
+        "fonts": false,
+        "animations": false
+    }
+
+name may be "firefox" or "chromium". Leaving out width and height
+maximizes the window instead. images, fonts and animations default to
+true, turning them off makes the browser lighter without changing what the
+tests can see.
+
+With "remote" the browser is started by a Selenium Grid (or any other
+WebDriver server) instead of on this machine. It is the server's URL, or a
+list of URLs which sessions are spread across, each session going to the
+next one which accepts it.
+"""
+import os
+import logging
+import itertools
+from time import time
+
+from selenium import webdriver
+
+log = logging.getLogger(__name__)
+
+# Which of the remote URLs the next session tries first
+_next_remote = itertools.count()
+
+NO_ANIMATIONS_SCRIPT = """
+if (window.jQuery) { window.jQuery.fx.off = true; }
+var style = document.createElement("style");
+style.innerHTML = "*, *::before, *::after {" +
+    "transition: none !important; animation: none !important; }";
+document.head.appendChild(style);
+"""
+
+
+def _firefox_options(config):
+    options = webdriver.FirefoxOptions()
+    if config.get("headless"):
+        options.add_argument("-headless")
+    if not config.get("images", True):
+        options.set_preference("permissions.default.image", 2)
+    if not config.get("fonts", True):
+        options.set_preference("browser.display.use_document_fonts", 0)
+        options.set_preference("gfx.downloadable_fonts.enabled", False)
+    if not config.get("animations", True):
+        options.set_preference("ui.prefersReducedMotion", 1)
+        options.set_preference("toolkit.cosmeticAnimations.enabled", False)
+    return options
+
+
+def _chromium_options(config):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--disable-dev-shm-usage")
+    if config.get("headless"):
+        options.add_argument("--headless")
+        options.add_argument("--disable-gpu")
+    if config.get("width") and config.get("height"):
+        options.add_argument("--window-size={},{}".format(
+            config["width"], config["height"]
+        ))
+    if not config.get("images", True):
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+    if not config.get("fonts", True):
+        options.add_argument("--disable-remote-fonts")
+    if not config.get("animations", True):
+        options.add_argument("--force-prefers-reduced-motion")
+    return options
+
+
+def _start_remote(remote, options):
+    """A session on the first of the remote URLs to accept one."""
+    urls = [remote] if isinstance(remote, str) else list(remote)
+    first = next(_next_remote)
+    error = None
+    for i in range(len(urls)):
+        url = urls[(first + i) % len(urls)]
+        try:
+            driver = webdriver.Remote(command_executor=url, options=options)
+        except Exception as e:
+            log.debug("{} did not start a session: {}".format(url, e))
+            error = e
+            continue
+        log.debug("Started session on {}".format(url))
+        return driver
+    raise error
+
+
+def start_driver(config):
+    """Start a browser as described by config, logging how long it took."""
+    name = config.get("name", "firefox")
+    start = time()
+    if name == "firefox":
+        options = _firefox_options(config)
+        factory = webdriver.Firefox
+    elif name in ("chromium", "chrome"):
+        options = _chromium_options(config)
+        factory = webdriver.Chrome
+    else:
+        raise ValueError("Unsupported browser {}".format(name))
+    if config.get("remote"):
+        driver = _start_remote(config["remote"], options)
+    else:
+        driver = factory(options=options)
+
+    if config.get("width") and config.get("height"):
+        driver.set_window_size(config["width"], config["height"])
+    else:
+        driver.maximize_window()
+    log.info("Started {}{}{} in {:.3f}s".format(
+        name, " (headless)" if config.get("headless") else "",
+        " (remote)" if config.get("remote") else "", time() - start
+    ))
+    return driver
+
+
+def prepare_page(driver, config):
+    """Apply the parts of the profile which live in the page itself, call
+    this after loading MAST web.
+    """
+    if not config.get("animations", True):
+        driver.execute_script(NO_ANIMATIONS_SCRIPT)
+
+
+def _process_tree(pid):
+    """pid and all of its descendants, read from /proc."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open("/proc/{}/stat".format(entry)) as fp:
+                stat = fp.read()
+        except (IOError, OSError):
+            continue
+        # The command name is in parentheses and may contain spaces
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    tree = []
+    stack = [pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def _memory(driver, field):
+    """field from /proc/<pid>/status in bytes, summed over the driver and
+    browser processes. Returns None where this can't be measured, such as
+    for a remote browser.
+    """
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    if not os.path.isdir("/proc"):
+        return None
+    total = 0
+    for pid in _process_tree(pid):
+        try:
+            with open("/proc/{}/status".format(pid)) as fp:
+                for line in fp:
+                    if line.startswith(field + ":"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (IOError, OSError):
+            continue
+    return total
+
+
+def peak_memory(driver):
+    """Peak resident memory in bytes of the driver and browser processes,
+    summed over each process. Returns None where this can't be measured.
+    """
+    return _memory(driver, "VmHWM")
+
+
+def current_memory(driver):
+    """Resident memory in bytes of the driver and browser processes right
+    now. Returns None where this can't be measured.
+    """
+    return _memory(driver, "VmRSS")
+
+
+def stop_driver(driver):
+    """Log the session's peak memory and close the browser."""
+    memory = peak_memory(driver)
+    if memory is not None:
+        log.info("Browser session peak memory {:.1f} MB".format(
+            memory / 1024.0 / 1024.0
+        ))
+    driver.quit()
@@ -0,0 +1,482 @@
+"""Command line interface for the MAST web tests.
+
+    python -m mast_tests --list
+    python -m mast_tests list_domains add_domain
+    python -m mast_tests -k domain
+    python -m mast_tests --failed
+
+With no test names every registered test is run. Nothing is read, logged
+or launched until it is needed, so listing the tests is instant and
+running one test only starts the browser that test needs.
+"""
+import os
+import logging
+import argparse
+import fnmatch
+from collections import OrderedDict
+
+from mast_tests import fixtures
+from mast_tests import naming
+from mast_tests import report
+from mast_tests.graph import Graph
+from mast_tests.policy import Policy, ABORT
+from mast_tests.runner import registry, PASSED, FAILED
+
+log = logging.getLogger(__name__)
+
+
+def parser():
+    parser = argparse.ArgumentParser(
+        description="Test MAST web through its UI",
+    )
+    parser.add_argument(
+        "tests",
+        nargs="*",
+        metavar="TEST",
+        help="run only these tests",
+    )
+    parser.add_argument(
+        "-l", "--list",
+        action="store_true",
+        help="list the selected tests instead of running them",
+    )
+    parser.add_argument(
+        "-k", "--select",
+        metavar="PATTERN",
+        help="run only the tests whose name matches PATTERN, a substring "
+             "or a shell-style wildcard",
+    )
+    parser.add_argument(
+        "-c", "--config",
+        default=fixtures.config_path,
+        help="configuration file (default %(default)s)",
+    )
+    parser.add_argument(
+        "-x", "--fail-fast",
+        action="store_true",
+        help="stop starting tests after the first failure, apart from those "
+             "which clean up",
+    )
+    parser.add_argument(
+        "--network",
+        action="store_true",
+        help="record the requests each test makes and summarize them in "
+             "the report",
+    )
+    parser.add_argument(
+        "--monitor",
+        action="store_true",
+        help="keep the status charts running in a browser of their own for "
+             "the whole run and check that they keep updating",
+    )
+    parser.add_argument(
+        "--footprint",
+        action="store_true",
+        help="record the JS heap, elements, event listeners and long tasks "
+             "each test adds to the page and summarize them in the report",
+    )
+    parser.add_argument(
+        "--rerun",
+        metavar="TEST",
+        help="run only TEST along with the tests it depends on and the "
+             "tests which clean up after them",
+    )
+    parser.add_argument(
+        "--failed",
+        action="store_true",
+        help="run only the tests which did not pass last time, along with "
+             "the tests they depend on and the tests which clean up after "
+             "them",
+    )
+    parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="run only the tests whose configuration, appliances or code "
+             "changed since they last ran, along with the tests they depend "
+             "on and the tests which clean up after them",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        metavar="N",
+        help="split the run across N worker processes, each running a "
+             "share of the tests against a share of the appliances",
+    )
+    parser.add_argument(
+        "--local-grid",
+        action="store_true",
+        help="start the sharded workers' browsers on grid nodes run on "
+             "this machine",
+    )
+    parser.add_argument(
+        "--api",
+        action="store_true",
+        help="check the backend over HTTP instead of running the browser "
+             "tests",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="measure MAST web's latency and throughput under load instead "
+             "of running the browser tests",
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="NAME",
+        help="compare the benchmark against the baseline saved as NAME",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        metavar="NAME",
+        help="save the benchmark as the baseline NAME",
+    )
+    parser.add_argument(
+        "--scale",
+        action="store_true",
+        help="run the suite against growing numbers of synthetic appliances "
+             "on a stand-in MAST web",
+    )
+    return parser
+
+
+def select(tests, names=(), pattern=None, rerun=None):
+    """The tests named in names and matching pattern, or the rerun plan
+    for rerun, in declaration order.
+    """
+    known = set(t.name for t in tests)
+    unknown = [name for name in list(names) + ([rerun] if rerun else [])
+               if name not in known]
+    if unknown:
+        raise SystemExit("Unknown test(s): {}".format(", ".join(unknown)))
+    if rerun:
+        return Graph(tests).rerun_plan(rerun)
+    selected = [t for t in tests if not names or t.name in names]
+    if pattern:
+        if not any(c in pattern for c in "*?["):
+            pattern = "*{}*".format(pattern)
+        selected = [t for t in selected if fnmatch.fnmatch(t.name, pattern)]
+    return selected
+
+
+def select_from_history(tests, candidates, failed=False, changed=False):
+    """The plan re-running those of candidates which did not pass last
+    time (with failed) or changed since (with changed), in declaration
+    order, and the seconds they took last time.
+    """
+    from mast_tests import history
+
+    past = history.History(history.history_path(fixtures.get("cache")),
+                           [t.name for t in tests])
+    names = []
+    if failed:
+        names.extend(past.failed(candidates))
+    if changed:
+        names.extend(past.changed(candidates, history.fingerprints(
+            candidates, fixtures.get("config"), fixtures.get
+        )))
+    if not names:
+        return [], 0.0
+    return Graph(tests).plan(names), past.duration(set(names))
+
+
+def list_tests(tests):
+    """Print each test by the name selection takes, with what it touches."""
+    for t in tests:
+        details = [
+            "{} {}".format(kind, ", ".join(resources))
+            for kind, resources in (("creates", t.creates),
+                                    ("reads", t.reads),
+                                    ("destroys", t.destroys))
+            if resources
+        ]
+        print("{}{}".format(
+            t.name,
+            " ({})".format("; ".join(details)) if details else "",
+        ))
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+
+    # Importing the suite registers the tests, it doesn't start anything
+    import mast_tests.suite  # noqa: F401
+
+    fixtures.config_path = args.config
+    tests = select(registry, args.tests, args.select, args.rerun)
+    if args.failed or args.changed:
+        tests, took = select_from_history(registry, tests, args.failed,
+                                          args.changed)
+    if args.list:
+        list_tests(tests)
+        return 0
+
+    config = fixtures.get("config")
+
+    from mast_tests import logs
+    from mast_tests import waits
+    logs.configure(config["logging"], ["mast_tests"])
+    waits.default_timeout = fixtures.get("timeout")
+
+    if args.scale:
+        return run_scale(config)
+    if args.benchmark:
+        return run_benchmark(config, args.baseline, args.save_baseline)
+    if args.api:
+        return run_api(config)
+    if args.rerun:
+        log.info("Re-running {}".format(", ".join(t.name for t in tests)))
+    if args.failed or args.changed:
+        if not tests:
+            log.info("Nothing to re-run")
+            return 0
+        log.info("Re-running {}, which took {:.1f}s last time".format(
+            ", ".join(t.name for t in tests), took
+        ))
+    shards_config = config.get("shards", {})
+    workers = args.shards or shards_config.get("workers", 1)
+    if workers > 1:
+        worker_args = [flag for flag, wanted in (("-x", args.fail_fast),
+                                                 ("--network", args.network),
+                                                 ("--footprint",
+                                                  args.footprint))
+                       if wanted]
+        return run_sharded(config, tests, workers,
+                           args.local_grid or
+                           shards_config.get("local_grid", False),
+                           worker_args)
+    policy = Policy(**config.get("policy", {}))
+    if args.fail_fast:
+        policy.on_failure = ABORT
+    network_config = dict(config.get("network", {}))
+    if network_config.pop("capture", False) or args.network:
+        from mast_tests.network import NetworkCapture
+        capture = NetworkCapture(**network_config)
+    else:
+        capture = None
+    footprint_config = dict(config.get("footprint", {}))
+    if footprint_config.pop("capture", False) or args.footprint:
+        from mast_tests import locators
+        from mast_tests.footprint import FootprintMonitor
+        from mast_tests.monitor import ChartMonitor
+        tabs = dict((t.name, t.tab) for t in registry if t.tab is not None)
+        unknown = sorted(set(tabs.values()) - set(locators.TABS))
+        assert not unknown, "Unknown tabs {}".format(", ".join(unknown))
+        tabs[ChartMonitor.name] = "status"
+        footprint = FootprintMonitor(tabs=tabs, **footprint_config)
+    else:
+        footprint = None
+    monitor_config = dict(config.get("monitor", {}))
+    if not (monitor_config.pop("capture", False) or args.monitor):
+        monitor_config = None
+    results = run_tests(config, tests, policy, capture, footprint,
+                        monitor_config)
+    return 0 if passed(tests, results) else 1
+
+
+def passed(tests, results):
+    """Whether every one of tests passed and nothing else run alongside
+    them failed. A monitor which had nothing to judge is skipped without
+    failing the run.
+    """
+    return all(
+        results[t.name].status == PASSED for t in tests if t.name in results
+    ) and not any(r.status == FAILED for r in results.values())
+
+
+def clean_up(config, resources):
+    """Remove resources the tests left behind over HTTP, which doesn't
+    depend on the state of any browser.
+    """
+    from mast_tests.actions import cleanups
+    from mast_tests.api import Client, clean_up
+
+    client = Client(fixtures.get("address"), fixtures.get("appliances"),
+                    timeout=fixtures.get("timeout"), **config.get("api", {}))
+    try:
+        return clean_up(client, cleanups(fixtures.get("names")), resources)
+    finally:
+        client.close()
+
+
+def run_tests(config, tests, policy, capture=None, footprint=None,
+              monitor=None):
+    """Run tests in a pool of browser sessions, with the status chart
+    monitor alongside if given its settings in monitor, clean up whatever
+    they left behind and write the report. capture, if given, records each
+    test's network traffic and footprint what each test adds to the page.
+    """
+    from mast_tests import history
+    from mast_tests import locators
+    from mast_tests.browser import stop_driver
+    from mast_tests.monitor import ChartMonitor
+    from mast_tests.runner import run, SessionPool
+
+    names = fixtures.get("names")
+    if names.prefix:
+        log.info("Naming what the tests create with prefix {}".format(
+            names.prefix
+        ))
+    watchers = [w for w in (capture, footprint) if w is not None]
+    chart_monitor = None
+    if monitor is not None:
+        chart_monitor = ChartMonitor(fixtures.start_session, close=stop_driver,
+                                     watchers=watchers, **monitor).start()
+
+    pool = SessionPool(fixtures.start_session, fixtures.get("sessions"),
+                       close=stop_driver)
+    try:
+        results = run(tests, pool, fixtures.get, policy,
+                      cleanup=lambda resources: clean_up(config, resources),
+                      watchers=watchers)
+    finally:
+        pool.close()
+        if chart_monitor is not None:
+            chart_monitor.stop()
+        locators.log_timings()
+    extra = {}
+    if chart_monitor is not None:
+        results[chart_monitor.name] = chart_monitor.result()
+        extra["status_charts"] = chart_monitor.summary()
+    if capture is not None:
+        extra["network"] = capture.log_summary()
+    if footprint is not None:
+        extra["footprint"] = footprint.log_summary()
+    extra["namespace"] = names.prefix
+    report.write(config.get("report"), results, extra)
+    # A sharded run's history is kept by the process which launched it
+    if not os.environ.get(naming.WORKER_VARIABLE):
+        history.History(
+            history.history_path(fixtures.get("cache")),
+            [t.name for t in registry],
+        ).update(results, history.fingerprints(tests, config, fixtures.get))
+    return results
+
+
+def run_sharded(config, tests, workers, local_grid=False, worker_args=()):
+    """Run tests in worker processes as planned by ``shard.plan``, then
+    merge their reports and logs.
+    """
+    from mast_tests import history
+    from mast_tests import shard
+    from mast_tests.grid import LocalGrid
+
+    shards_config = config.get("shards", {})
+    cache = fixtures.get("cache")
+    sessions = fixtures.get("sessions")
+    names = fixtures.get("names")
+    past = history.History(history.history_path(cache),
+                           [t.name for t in registry])
+    shards = shard.plan(
+        tests, fixtures.get("appliances"), workers,
+        dict((name, test["duration"]) for name, test in past.tests.items()),
+    )
+    grid = None
+    if local_grid:
+        grid = LocalGrid(
+            fixtures.get("browser_config").get("name", "firefox"),
+            len(shards) * sessions,
+            port=shards_config.get("port", 4444),
+            timeout=fixtures.get("timeout"),
+        ).start()
+        remotes = [grid.urls[i * sessions:(i + 1) * sessions]
+                   for i in range(len(shards))]
+    else:
+        remotes = [shards_config.get("grid")] * len(shards)
+    try:
+        shard.run_shards(shards, config, cache, remotes, names.prefix,
+                         worker_args)
+    finally:
+        if grid is not None:
+            grid.stop()
+    merged = shard.merge_reports(shards)
+    merged["namespace"] = names.prefix
+    report.save(config.get("report"), merged)
+    shard.merge_logs(shards, config["logging"])
+    results = shard.results(merged)
+    past.update(results, history.fingerprints(tests, config, fixtures.get))
+    ok = passed(tests, results)
+    return 0 if ok and all(s.returncode == 0 for s in shards) else 1
+
+
+def run_api(config):
+    from mast_tests.actions import BACKEND_CHECKS
+    from mast_tests.api import Client, run_checks
+
+    client = Client(fixtures.get("address"), fixtures.get("appliances"),
+                    timeout=fixtures.get("timeout"), **config.get("api", {}))
+    try:
+        results = run_checks(client, BACKEND_CHECKS,
+                             workers=fixtures.get("sessions"))
+    finally:
+        client.close()
+    report.write(config.get("report"),
+                 OrderedDict((result.name, result) for result in results))
+    return 0 if all(r.status == PASSED for r in results) else 1
+
+
+def run_benchmark(config, baseline=None, save_baseline=None):
+    from mast_tests import benchmark
+    from mast_tests.actions import BENCHMARKS
+
+    benchmark_config = config.get("benchmark", {})
+    cache = fixtures.get("cache")
+    results = benchmark.run_benchmarks(
+        fixtures.get("address"),
+        fixtures.get("appliances"),
+        BENCHMARKS,
+        iterations=benchmark_config.get("iterations", 20),
+        concurrency=benchmark_config.get("concurrency", [1]),
+        appliance_counts=benchmark_config.get("appliances"),
+        timeout=fixtures.get("timeout"),
+        api=config.get("api"),
+    )
+    benchmark.save(results, benchmark.baseline_path(cache, "latest"))
+    if save_baseline:
+        benchmark.save(results, benchmark.baseline_path(cache, save_baseline))
+    regressions = []
+    if baseline:
+        regressions = benchmark.compare(
+            results,
+            benchmark.load(benchmark.baseline_path(cache, baseline)),
+            tolerance=benchmark_config.get("tolerance", 0.2),
+        )
+    failed = benchmark.failures(results)
+    for key, name, errors in failed:
+        log.error("Benchmark {} {}: {} requests failed".format(
+            key, name, errors
+        ))
+    return 1 if regressions or failed else 0
+
+
+def run_scale(config):
+    from mast_tests import scale
+    from mast_tests.browser import stop_driver, peak_memory
+    from mast_tests.runner import run, SessionPool
+
+    scale_config = config.get("scale", {})
+
+    def run_suite(address, appliances):
+        # Registering the appliances is part of what is being measured, so
+        # no snapshot is used
+        fixtures.override(config=config, address=address,
+                          appliances=appliances, snapshot=None)
+        pool = SessionPool(fixtures.start_session, fixtures.get("sessions"),
+                           close=stop_driver)
+        try:
+            results = run(registry, pool, fixtures.get,
+                          Policy(**config.get("policy", {})))
+            memory = [peak_memory(driver) for driver in pool.drivers]
+        finally:
+            pool.close()
+        memory = [m for m in memory if m is not None]
+        setup = max(pool.startup) if pool.startup else 0.0
+        return setup, results, max(memory) if memory else None
+
+    steps = scale.run_scale(
+        scale_config.get("appliances", [2, 8, 32]),
+        run_suite,
+        latency=scale_config.get("latency", 0.0),
+    )
+    scale.log_scaling(steps)
+    scale.save(steps, scale_config.get("output", "scale.json"))
+    return 0
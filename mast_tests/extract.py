@@ -0,0 +1,96 @@
+"""Read the output of MAST web in a single WebDriver round trip.
+
+Reading ``results.text`` for every expected string, or the value of every
+appliance's ssh textarea one at a time, costs a request to the browser
+each time. read_outputs fetches every results pane and textarea asked for
+with one ``execute_script`` call and verify checks all of the expected
+text against that in one pass.
+"""
+import logging
+
+from selenium.webdriver.common.by import By
+
+log = logging.getLogger(__name__)
+
+READ_OUTPUTS_SCRIPT = """
+var panes = arguments[0], textareas = arguments[1];
+var result = {panes: {}, textareas: {}};
+panes.forEach(function (selector) {
+    var elem = document.querySelector(selector);
+    result.panes[selector] = elem ? elem.innerText : null;
+});
+textareas.forEach(function (name) {
+    var elem = document.getElementsByName(name)[0];
+    result.textareas[name] = elem ? elem.value : null;
+});
+return result;
+"""
+
+
+def css_selector(locator):
+    """The CSS selector for locator, a CSS selector or ID locator."""
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return value
+    if by == By.ID:
+        return "#" + value
+    raise ValueError("Unable to read output at {}, only CSS selectors and "
+                     "IDs are supported".format(locator))
+
+
+def _describe(key):
+    """A pane's selector or a textarea's name."""
+    return key[1] if isinstance(key, tuple) else key
+
+
+def read_outputs(driver, panes=(), textareas=()):
+    """Return a dict of the text of each results pane locator in panes and
+    the value of each textarea name in textareas, None for any which are
+    missing from the page.
+    """
+    panes = list(panes)
+    textareas = list(textareas)
+    data = driver.execute_script(
+        READ_OUTPUTS_SCRIPT, [css_selector(l) for l in panes], textareas
+    )
+    outputs = {}
+    for locator in panes:
+        outputs[locator] = data["panes"][css_selector(locator)]
+    for name in textareas:
+        outputs[name] = data["textareas"][name]
+    return outputs
+
+
+def missing_texts(outputs, expected):
+    """(key, text) for every text in expected[key] which isn't in
+    outputs[key].
+    """
+    missing = []
+    for key, texts in expected.items():
+        output = outputs.get(key) or ""
+        missing.extend((key, text) for text in texts if text not in output)
+    return missing
+
+
+def verify(driver, panes=None, textareas=None):
+    """Assert every expected text is in its output.
+
+    panes maps results pane locators, and textareas maps textarea names, to
+    the texts expected in them. All of the outputs are read at once and
+    every missing text is reported together. Returns the outputs.
+    """
+    panes = panes or {}
+    textareas = textareas or {}
+    outputs = read_outputs(driver, panes, textareas)
+    expected = dict(panes)
+    expected.update(textareas)
+    missing = missing_texts(outputs, expected)
+    if missing:
+        raise AssertionError("Expected text not found: {}".format(
+            "; ".join("{!r} in {}".format(text, _describe(key))
+                      for key, text in missing)
+        ))
+    log.debug("Found {} expected texts in {} outputs".format(
+        sum(len(texts) for texts in expected.values()), len(expected)
+    ))
+    return outputs
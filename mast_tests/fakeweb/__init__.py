@@ -0,0 +1,151 @@
+"""A stand-in for MAST web which needs no DataPower appliances.
+
+It serves a page with the structure ui-tests.py relies on and answers
+every form with canned per-appliance output after a configurable delay, so
+the suite can be run and benchmarked on any machine::
+
+    python -m mast_tests.fakeweb --port 5000 --latency 0.2
+
+then set "address" in config.json to "http://localhost:5000". Any hostname
+can be registered as an appliance.
+"""
+import os
+import json
+import logging
+import threading
+from time import sleep
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from mast_tests.fakeweb import responses
+from mast_tests.fakeweb.page import render_page, PROVIDERS
+
+log = logging.getLogger(__name__)
+
+STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+class State(object):
+    """What the fake appliances currently have configured."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.domains = set(["default"])
+        self.groups = set(["admin"])
+        self.users = set(["admin"])
+        self.ssh_depth = {}
+
+
+class Handler(BaseHTTPRequestHandler):
+    # Set on the subclass created for each FakeMAST
+    fake = None
+
+    def log_message(self, format, *args):
+        log.debug("fakeweb: " + format, *args)
+
+    def _send(self, body, content_type="text/html", status=200):
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type + "; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/":
+            self._send(self.fake.page)
+        elif url.path.startswith("/static/"):
+            path = os.path.join(STATIC, os.path.basename(url.path))
+            if not os.path.isfile(path):
+                return self._send("Not Found", "text/plain", 404)
+            with open(path) as fp:
+                self._send(fp.read(), "application/javascript")
+        elif url.path == "/options":
+            state = self.fake.state
+            with state.lock:
+                options = {
+                    "domains": sorted(state.domains),
+                    "groups": sorted(state.groups),
+                    "users": sorted(state.users),
+                    "providers": PROVIDERS,
+                }
+            self._send(json.dumps(options), "application/json")
+        elif url.path == "/status":
+            hostnames = query.get("appliances[]", [])
+            metric = query.get("metric", [""])[0]
+            self.fake.delay(hostnames)
+            self._send(json.dumps(dict(
+                (hostname, responses.status(self.fake.state, hostname, metric))
+                for hostname in hostnames
+            )), "application/json")
+        else:
+            self._send("Not Found", "text/plain", 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"),
+                        keep_blank_values=True)
+        hostnames = form.get("appliances[]", [])
+        tab = urlparse(self.path).path.strip("/")
+        self.fake.delay(hostnames)
+        state = self.fake.state
+        if tab == "ssh":
+            session = form.get("session", [""])[0]
+            command = form.get("command", [""])[0]
+            with state.lock:
+                output = dict(
+                    (hostname, responses.ssh(state, session, hostname, command))
+                    for hostname in hostnames
+                )
+            return self._send(json.dumps(output), "application/json")
+        with state.lock:
+            output = responses.respond(state, hostnames, form)
+        self._send(output, "text/plain")
+
+
+class FakeMAST(object):
+    """The stand-in server.
+
+    latency is how long, in seconds, each appliance takes to answer and
+    appliance_latency overrides that per hostname. Requests fan out to the
+    selected appliances concurrently, so a response takes as long as the
+    slowest of them.
+    """
+    def __init__(self, host="127.0.0.1", port=5000, latency=0.0,
+                 appliance_latency=None):
+        self.latency = latency
+        self.appliance_latency = appliance_latency or {}
+        self.state = State()
+        self.page = render_page()
+        handler = type("Handler", (Handler,), {"fake": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def delay(self, hostnames):
+        delays = [
+            self.appliance_latency.get(hostname, self.latency)
+            for hostname in hostnames
+        ]
+        if delays and max(delays) > 0:
+            sleep(max(delays))
+
+    def start(self):
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        log.info("Fake MAST web listening on {}".format(self.address))
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,45 @@
+import logging
+import argparse
+
+from mast_tests.fakeweb import FakeMAST
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m mast_tests.fakeweb",
+        description="Serve a stand-in MAST web for offline test runs",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds each appliance takes to respond",
+    )
+    parser.add_argument(
+        "--appliance-latency",
+        action="append",
+        default=[],
+        metavar="HOSTNAME=SECONDS",
+        help="override --latency for one appliance, may be repeated",
+    )
+    args = parser.parse_args(argv)
+
+    appliance_latency = {}
+    for value in args.appliance_latency:
+        hostname, _, seconds = value.partition("=")
+        appliance_latency[hostname] = float(seconds)
+
+    logging.basicConfig(level=logging.INFO)
+    fake = FakeMAST(args.host, args.port, args.latency, appliance_latency)
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
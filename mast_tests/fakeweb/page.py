@@ -0,0 +1,285 @@
+"""The HTML for the stand-in MAST web page.
+
+Only the structure the tests rely on is reproduced: the tab links, a
+table per tab holding the action buttons, the current form and the output
+pane, the appliance selection at the top, the status charts and the ssh
+textareas. The tabs are nested as they are on the real page, without IDs
+or classes it lacks, as the tests find each tab's output pane by position.
+"""
+import json
+from html import escape
+
+TABS = [
+    "accounts",
+    "backups",
+    "crypto",
+    "deployment",
+    "developer",
+    "network",
+    "ssh",
+    "status",
+    "system",
+]
+
+# Status providers offered by get status
+PROVIDERS = [
+    "CPUUsage",
+    "DateTimeStatus",
+    "EthernetInterfaceStatus",
+    "FilesystemStatus",
+    "MemoryStatus",
+    "SystemUsage",
+    "TCPSummary",
+]
+
+# Metrics which can be charted on the status tab
+METRICS = [
+    "CPUUsage.tenSeconds",
+    "MemoryStatus.Usage",
+    "TCPSummary.established",
+    "FilesystemStatus.FreeTemporary",
+    "FilesystemStatus.FreeEncrypted",
+    "FilesystemStatus.FreeInternal",
+    "SystemUsage.Load",
+    "SystemUsage.WorkList",
+]
+
+NO_CHECK_HOSTNAME = ("checkbox", "no_check_hostname")
+SAVE_CONFIG = ("checkbox", "save_config")
+
+# form name -> fields as (kind, name[, option source])
+FORMS = {
+    "get_status": [
+        ("multiselect", "StatusProvider", "providers"),
+        ("select", "Domain", "domains"),
+        NO_CHECK_HOSTNAME,
+    ],
+    "add_domain": [("text", "domain_name"), NO_CHECK_HOSTNAME],
+    "del_domain": [
+        ("select", "Domain", "domains"),
+        SAVE_CONFIG,
+        NO_CHECK_HOSTNAME,
+    ],
+    "get_filestore": [
+        ("select", "Domain", "domains"),
+        ("text", "location"),
+        NO_CHECK_HOSTNAME,
+    ],
+    "clean_up": [
+        ("checkbox", "checkpoints"),
+        ("checkbox", "export"),
+        ("checkbox", "logtemp"),
+        ("checkbox", "logstore"),
+        ("checkbox", "error_reports"),
+        ("checkbox", "recursive"),
+        ("checkbox", "backup_files"),
+        ("select", "Domain", "domains"),
+    ],
+    "add_group": [
+        ("text", "name"),
+        ("multitext", "access_policies"),
+        NO_CHECK_HOSTNAME,
+    ],
+    "add_user": [
+        ("text", "username"),
+        ("password", "password"),
+        ("text", "group"),
+        SAVE_CONFIG,
+        NO_CHECK_HOSTNAME,
+    ],
+    "del_user": [SAVE_CONFIG, NO_CHECK_HOSTNAME, ("select", "User", "users")],
+    "del_group": [
+        SAVE_CONFIG,
+        NO_CHECK_HOSTNAME,
+        ("select", "UserGroup", "groups"),
+    ],
+    "get_normal_backup": [
+        ("text", "comment"),
+        ("multiselect", "Domain", "domains"),
+        NO_CHECK_HOSTNAME,
+    ],
+    "set_checkpoint": [
+        ("text", "comment"),
+        ("multiselect", "Domain", "domains"),
+        NO_CHECK_HOSTNAME,
+    ],
+    "flush_document_cache": [
+        ("text", "xml_manager"),
+        ("select", "Domain", "domains"),
+        NO_CHECK_HOSTNAME,
+    ],
+    "list_probes": [("multiselect", "Domain", "domains"), NO_CHECK_HOSTNAME],
+    "tcp_connection_test": [
+        ("multitext", "remote_hosts"),
+        ("multitext", "remote_ports"),
+        NO_CHECK_HOSTNAME,
+    ],
+}
+
+# Buttons on each tab, clean up is deliberately the 43rd on the system tab
+ACTIONS = {
+    "accounts": [
+        "list groups",
+        "add group",
+        "del group",
+        "list users",
+        "add user",
+        "del user",
+        "change password",
+    ],
+    "backups": [
+        "get normal backup",
+        "get secure backup",
+        "list checkpoints",
+        "set checkpoint",
+        "rollback checkpoint",
+    ],
+    "crypto": ["list certificates", "list keys"],
+    "deployment": ["deploy", "export object", "import configuration"],
+    "developer": ["flush document cache", "flush stylesheet cache",
+                  "list probes"],
+    "network": ["tcp connection test", "display routing table",
+                "list host aliases", "list static routes"],
+    "ssh": [],
+    "status": [],
+    "system": [
+        "add domain", "del domain", "list domains", "disable domain",
+        "enable domain", "quiesce domain", "unquiesce domain",
+        "restart domain", "save config", "get status", "get config",
+        "get filestore", "get file", "set file", "del file", "copy file",
+        "copy directory", "list files", "location exists", "get logs",
+        "get error reports", "get encrypted filesystem",
+        "get temporary filesystem", "fetch logs", "flush aaa cache",
+        "flush arp cache", "flush dns cache", "flush ldap pool cache",
+        "flush nd cache", "flush nfs cache", "flush pdp cache",
+        "flush rbm cache", "quiesce service", "unquiesce service",
+        "quiesce appliance", "unquiesce appliance", "reboot appliance",
+        "shutdown appliance", "reload appliance", "firmware upgrade",
+        "import", "export", "clean up", "xor", "objects by status",
+    ],
+}
+
+
+def form_name(action):
+    return action.replace(" ", "_")
+
+
+def _field(field):
+    kind, name = field[0], field[1]
+    if kind == "checkbox":
+        control = '<input type="checkbox" name="{0}" value="{0}">'.format(
+            escape(name)
+        )
+    elif kind in ("text", "password"):
+        control = '<input type="{}" name="{}">'.format(kind, escape(name))
+    elif kind in ("select", "multiselect"):
+        control = '<select name="{}" data-source="{}"{}></select>'.format(
+            escape(name),
+            field[2],
+            ' class="multiSelect" multiple' if kind == "multiselect" else ""
+        )
+    elif kind == "multitext":
+        return (
+            '<div class="field multiText" data-name="{}">'
+            '<input type="text" class="multiTextTextbox">'
+            '<input type="button" class="multiTextButton" value="add">'
+            '<ul class="multiTextValues"></ul>'
+            '</div>'
+        ).format(escape(name))
+    else:
+        raise ValueError("Unknown field kind {}".format(kind))
+    return '<div class="field"><label>{}</label>{}</div>'.format(
+        escape(name), control
+    )
+
+
+def render_form(tab, action):
+    name = form_name(action)
+    fields = FORMS.get(name, [NO_CHECK_HOSTNAME])
+    # The fields must start at the form's second div, after the title
+    return "".join([
+        '<div class="actionForm" name="{}" data-tab="{}">'.format(name, tab),
+        '<div class="formTitle">{}</div>'.format(escape(action)),
+        "".join(_field(field) for field in fields),
+        '<input type="button" class="formSubmit" id="{}FormSubmit" '
+        'value="submit">'.format(tab),
+        '</div>',
+    ])
+
+
+def _tab(tab):
+    if tab == "ssh":
+        middle = (
+            '<input type="text" name="sshCommand">'
+            '<input type="button" name="sshCommandButton" value="send">'
+        )
+        output = '<div class="sshTextareas"></div>'
+    elif tab == "status":
+        middle = (
+            '<input type="button" name="metrics" value="metrics">'
+            '<div class="metricsPanel" style="display: none">{}</div>'
+            '<input type="button" name="statusCharting" value="start">'
+        ).format("".join(
+            '<label><input type="checkbox" value="{0}">{0}</label>'.format(m)
+            for m in METRICS
+        ))
+        output = '<div class="charts"></div>'
+    else:
+        middle = '<div class="formContainer"></div>'
+        output = '<pre></pre>'
+    buttons = "<br>".join(
+        '<input type="button" class="actionButton" id="{0}" value="{0}">'
+        .format(escape(action)) for action in ACTIONS[tab]
+    )
+    return (
+        '<div class="tab" data-tab="{0}" style="display: none">'
+        '<table><tbody><tr>'
+        '<td>{1}</td>'
+        '<td>{2}</td>'
+        '<td><div class="loading" style="display: none">'
+        'working...</div>{3}</td>'
+        '</tr></tbody></table>'
+        '</div>'
+    ).format(tab, buttons, middle, output)
+
+
+def render_page():
+    templates = {}
+    for tab in TABS:
+        for action in ACTIONS[tab]:
+            templates[form_name(action)] = render_form(tab, action)
+    return "\n".join([
+        "<!DOCTYPE html>",
+        "<html>",
+        "<head>",
+        "<title>M.A.S.T. for DP</title>",
+        "<style>",
+        ".loading { color: #a00; }",
+        ".charts canvas { border: 1px solid #ccc; }",
+        ".sshTextareas textarea { width: 40em; height: 15em; }",
+        "</style>",
+        "</head>",
+        "<body>",
+        '<div id="header"><h1>M.A.S.T. for DP</h1></div>',
+        '<div id="applianceSelection">'
+        '<input type="text" name="hostname" placeholder="hostname">'
+        '<input type="text" name="username" placeholder="username">'
+        '<input type="password" name="password" placeholder="password">'
+        '<label><input type="checkbox" name="global_no_check_hostname">'
+        'no check hostname</label>'
+        '<input type="button" id="addAppliance" value="add">'
+        '<ul id="applianceList"></ul>'
+        '</div>',
+        '<div id="content"><div id="tabs">',
+        '<ul class="tabLinks">{}</ul>'.format("".join(
+            '<li><a href="#" data-tab="{0}">{0}</a></li>'.format(tab)
+            for tab in TABS
+        )),
+        "".join(_tab(tab) for tab in TABS),
+        "</div></div>",
+        '<script type="application/json" id="formTemplates">{}</script>'
+        .format(json.dumps(templates).replace("</", "<\\/")),
+        '<script src="/static/fakeweb.js"></script>',
+        "</body>",
+        "</html>",
+    ])
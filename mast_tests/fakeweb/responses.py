@@ -0,0 +1,197 @@
+"""Canned output for the stand-in MAST web server.
+
+Every handler takes the server's State, the selected hostnames and the
+submitted form (a dict of name -> list of values) and returns the text
+shown in the output pane. Handlers for actions which change the appliances
+update State so later listings reflect them.
+"""
+import random
+from datetime import datetime
+
+
+def _table(header, rows):
+    rows = [header] + rows
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(str(cell).ljust(width) for cell, width in zip(row, widths))
+        .rstrip()
+        for row in rows
+    )
+
+
+def _per_appliance(hostnames, text):
+    return "\n".join("{}  {}".format(hostname, text) for hostname in hostnames)
+
+
+def get_status(state, hostnames, form):
+    providers = form.get("StatusProvider", ["DateTimeStatus"])
+    now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    sections = []
+    for provider in providers:
+        if provider == "DateTimeStatus":
+            header = ["Appliance", "time", "uptime", "bootuptime"]
+            rows = [[hostname, now, "10 days 02:14:33", "10 days 02:16:01"]
+                    for hostname in hostnames]
+        else:
+            header = ["Appliance", "Value"]
+            rows = [[hostname, random.randint(0, 100)]
+                    for hostname in hostnames]
+        sections.append("{}\n{}".format(provider, _table(header, rows)))
+    return "\n\n".join(sections)
+
+
+def _listing(hostnames, items):
+    items = ", ".join(sorted(items))
+    rows = [[hostname, items] for hostname in hostnames]
+    rows.append(["All", items])
+    return _table(["Appliance", "Names"], rows)
+
+
+def list_domains(state, hostnames, form):
+    return _listing(hostnames, state.domains)
+
+
+def add_domain(state, hostnames, form):
+    state.domains.add(form.get("domain_name", [""])[0])
+    return _per_appliance(hostnames, "Succeeded")
+
+
+def del_domain(state, hostnames, form):
+    for domain in form.get("Domain", []):
+        state.domains.discard(domain)
+    return _per_appliance(hostnames, "Succeeded")
+
+
+def get_filestore(state, hostnames, form):
+    return _per_appliance(hostnames, "See Download")
+
+
+def clean_up(state, hostnames, form):
+    lines = []
+    for hostname in hostnames:
+        lines.append(hostname)
+        for location in ("chkpoints:/", "export:/", "logtemp:/",
+                         "logstore:/", "ErrorReports"):
+            lines.append("    {}  Cleaned".format(location))
+    return "\n".join(lines)
+
+
+def list_groups(state, hostnames, form):
+    return _listing(hostnames, state.groups)
+
+
+def add_group(state, hostnames, form):
+    state.groups.add(form.get("name", [""])[0])
+    return _per_appliance(hostnames, "Succeeded")
+
+
+def del_group(state, hostnames, form):
+    for group in form.get("UserGroup", []):
+        state.groups.discard(group)
+    return _per_appliance(hostnames, "Succeeded")
+
+
+def list_users(state, hostnames, form):
+    return _listing(hostnames, state.users)
+
+
+def add_user(state, hostnames, form):
+    state.users.add(form.get("username", [""])[0])
+    return _per_appliance(hostnames, "Succeeded")
+
+
+def del_user(state, hostnames, form):
+    for user in form.get("User", []):
+        state.users.discard(user)
+    return _per_appliance(hostnames, "Succeeded")
+
+
+def get_normal_backup(state, hostnames, form):
+    return _per_appliance(hostnames, "Verified  See Download")
+
+
+def list_probes(state, hostnames, form):
+    return _table(["Appliance", "Result"],
+                  [[hostname, "No probes enabled"] for hostname in hostnames])
+
+
+def display_routing_table(state, hostnames, form):
+    header = ["Appliance", "IPType", "Destination", "PrefixLength",
+              "InterfaceType", "MacInterface", "GatewayIPType", "Gateway",
+              "Metric"]
+    rows = [[hostname, "ipv4", "0.0.0.0", "0", "Ethernet", "eth0", "ipv4",
+             "10.0.0.1", "0"] for hostname in hostnames]
+    return _table(header, rows)
+
+
+def tcp_connection_test(state, hostnames, form):
+    rows = []
+    for hostname in hostnames:
+        for remote_host in form.get("remote_hosts", []):
+            for remote_port in form.get("remote_ports", []):
+                rows.append([hostname, remote_host, remote_port, "True"])
+    return _table(["Appliance", "Remote Host", "Remote Port", "Success"],
+                  rows)
+
+
+def default(state, hostnames, form):
+    return _per_appliance(hostnames, "Succeeded")
+
+
+HANDLERS = {
+    "get_status": get_status,
+    "list_domains": list_domains,
+    "add_domain": add_domain,
+    "del_domain": del_domain,
+    "get_filestore": get_filestore,
+    "clean_up": clean_up,
+    "list_groups": list_groups,
+    "add_group": add_group,
+    "del_group": del_group,
+    "list_users": list_users,
+    "add_user": add_user,
+    "del_user": del_user,
+    "get_normal_backup": get_normal_backup,
+    "list_probes": list_probes,
+    "display_routing_table": display_routing_table,
+    "tcp_connection_test": tcp_connection_test,
+}
+
+
+def respond(state, hostnames, form):
+    handler = HANDLERS.get(form.get("callable", [""])[0], default)
+    return handler(state, hostnames, form)
+
+
+def ssh(state, session, hostname, command):
+    """One appliance's transcript for command in the given ssh session."""
+    key = (session, hostname)
+    depth = state.ssh_depth.get(key, 0)
+    lines = ["{}{}# {}".format(hostname, "(config)" if depth else "", command)]
+    if command == "show clock":
+        lines.append(datetime.now().strftime("%a %b %d %H:%M:%S %Y"))
+    elif command == "config":
+        lines.append("Global configuration mode")
+        depth += 1
+    elif command.startswith("switch domain"):
+        lines.append("")
+    elif command.startswith("dir "):
+        lines.append("   File Name                    Last Modified")
+        lines.append("   ---------                    -------------")
+        lines.append("   SimpleStatus/                Thu Jan  1 00:00:00 2026")
+    elif command.startswith("mkdir "):
+        lines.append("Directory created")
+    elif command == "exit":
+        if depth:
+            depth -= 1
+        else:
+            lines.append("Goodbye.")
+    else:
+        lines.append("% Unknown command")
+    state.ssh_depth[key] = depth
+    return "\n".join(lines) + "\n"
+
+
+def status(state, hostname, metric):
+    """A plausible reading for metric on hostname."""
+    return random.randint(0, 100)
@@ -0,0 +1,357 @@
+// Client side of the stand-in MAST web page.
+(function () {
+    "use strict";
+
+    var appliances = [];
+    var session = Math.random().toString(36).slice(2);
+    var templates = JSON.parse(
+        document.getElementById("formTemplates").textContent
+    );
+    var sshQueue = [];
+    var sshBusy = false;
+
+    // metric -> hostname -> list of [timestamp, value]
+    window.statusData = {};
+
+    function $(selector, context) {
+        return (context || document).querySelector(selector);
+    }
+
+    function $all(selector, context) {
+        return Array.prototype.slice.call(
+            (context || document).querySelectorAll(selector)
+        );
+    }
+
+    function closest(elem, className) {
+        while (elem && !(elem.classList && elem.classList.contains(className))) {
+            elem = elem.parentNode;
+        }
+        return elem;
+    }
+
+    function encode(pairs) {
+        return pairs.map(function (pair) {
+            return encodeURIComponent(pair[0]) + "=" +
+                encodeURIComponent(pair[1]);
+        }).join("&");
+    }
+
+    function applianceFields() {
+        var pairs = [];
+        appliances.forEach(function (appliance) {
+            pairs.push(["appliances[]", appliance.hostname]);
+            pairs.push([
+                "credentials[]",
+                appliance.username + ":" + appliance.password
+            ]);
+        });
+        return pairs;
+    }
+
+    function request(method, url, pairs, callback) {
+        var xhr = new XMLHttpRequest();
+        var body = encode(pairs);
+        if (method === "GET" && body) {
+            url += "?" + body;
+            body = null;
+        }
+        xhr.open(method, url);
+        if (body !== null) {
+            xhr.setRequestHeader(
+                "Content-Type", "application/x-www-form-urlencoded"
+            );
+        }
+        xhr.onload = function () {
+            callback(xhr.status, xhr.responseText);
+        };
+        xhr.onerror = function () {
+            callback(0, "Request to " + url + " failed");
+        };
+        xhr.send(body);
+    }
+
+    //////////////////////////////////////////////////////////////////////
+    // Appliances
+
+    // The selected appliances are kept in local storage so they survive
+    // a reload, the same way a restored session snapshot expects
+    function addAppliance(appliance) {
+        if (!appliance.hostname || document.getElementById(appliance.hostname)) {
+            return;
+        }
+        appliances.push(appliance);
+        var item = document.createElement("li");
+        item.id = appliance.hostname;
+        item.textContent = appliance.hostname;
+        $("#applianceList").appendChild(item);
+        renderTextareas();
+    }
+
+    $("#addAppliance").addEventListener("click", function () {
+        addAppliance({
+            hostname: $("#applianceSelection input[name=hostname]").value.trim(),
+            username: $("#applianceSelection input[name=username]").value,
+            password: $("#applianceSelection input[name=password]").value
+        });
+        window.localStorage.setItem("appliances", JSON.stringify(appliances));
+    });
+
+    //////////////////////////////////////////////////////////////////////
+    // Tabs and forms
+
+    function showTab(name) {
+        $all(".tab").forEach(function (tab) {
+            tab.style.display = tab.getAttribute("data-tab") === name ?
+                "" : "none";
+        });
+        if (name === "ssh") {
+            renderTextareas();
+        }
+    }
+
+    $all(".tabLinks a").forEach(function (link) {
+        link.addEventListener("click", function (event) {
+            event.preventDefault();
+            showTab(link.getAttribute("data-tab"));
+        });
+    });
+
+    function fillOptions(form) {
+        request("GET", "/options", [], function (status, text) {
+            var options = JSON.parse(text);
+            $all("select[data-source]", form).forEach(function (select) {
+                select.innerHTML = "";
+                options[select.getAttribute("data-source")].forEach(
+                    function (value) {
+                        var option = document.createElement("option");
+                        option.value = value;
+                        option.textContent = value;
+                        select.appendChild(option);
+                    }
+                );
+            });
+        });
+    }
+
+    $all(".actionButton").forEach(function (button) {
+        button.addEventListener("click", function () {
+            var name = button.id.replace(/ /g, "_");
+            var container = $(".formContainer", closest(button, "tab"));
+            container.innerHTML = templates[name];
+            fillOptions(container.firstChild);
+        });
+    });
+
+    function formFields(form) {
+        var pairs = [["callable", form.getAttribute("name")]];
+        $all("[name]", form).forEach(function (field) {
+            var name = field.getAttribute("name");
+            if (field === form) {
+                return;
+            }
+            if (field.type === "checkbox") {
+                if (field.checked) {
+                    pairs.push([name, "true"]);
+                }
+            } else if (field.tagName === "SELECT") {
+                $all("option", field).forEach(function (option) {
+                    if (option.selected) {
+                        pairs.push([name, option.value]);
+                    }
+                });
+            } else if (field.type !== "button") {
+                pairs.push([name, field.value]);
+            }
+        });
+        $all(".multiText", form).forEach(function (multiText) {
+            var name = multiText.getAttribute("data-name");
+            $all(".multiTextValues li", multiText).forEach(function (item) {
+                pairs.push([name, item.textContent]);
+            });
+        });
+        return pairs;
+    }
+
+    function showOutput(tab, text) {
+        var pre = $("td:nth-of-type(3) > pre", tab);
+        var output = document.createElement("div");
+        var close = document.createElement("span");
+        var content = document.createElement("span");
+        close.className = "output_close";
+        close.textContent = "[close]\n";
+        content.textContent = text;
+        output.appendChild(close);
+        output.appendChild(content);
+        pre.innerHTML = "";
+        pre.appendChild(output);
+    }
+
+    document.addEventListener("click", function (event) {
+        var target = event.target;
+        var form, tab, spinner;
+        if (target.classList.contains("multiTextButton")) {
+            var multiText = closest(target, "multiText");
+            var textbox = $(".multiTextTextbox", multiText);
+            if (textbox.value) {
+                var item = document.createElement("li");
+                item.textContent = textbox.value;
+                $(".multiTextValues", multiText).appendChild(item);
+                textbox.value = "";
+            }
+        } else if (target.classList.contains("formSubmit")) {
+            form = closest(target, "actionForm");
+            tab = closest(form, "tab");
+            spinner = $(".loading", tab);
+            target.disabled = true;
+            spinner.style.display = "";
+            request(
+                "POST",
+                "/" + form.getAttribute("data-tab"),
+                formFields(form).concat(applianceFields()),
+                function (status, text) {
+                    showOutput(tab, text);
+                    spinner.style.display = "none";
+                    target.disabled = false;
+                }
+            );
+        } else if (target.classList.contains("output_close")) {
+            var output = target.parentNode;
+            output.parentNode.removeChild(output);
+        }
+    });
+
+    //////////////////////////////////////////////////////////////////////
+    // SSH
+
+    function renderTextareas() {
+        var container = $(".sshTextareas");
+        appliances.forEach(function (appliance) {
+            var name = "textarea_" + appliance.hostname;
+            if (!$("textarea[name='" + name + "']", container)) {
+                var textarea = document.createElement("textarea");
+                textarea.name = name;
+                textarea.readOnly = true;
+                container.appendChild(textarea);
+            }
+        });
+    }
+
+    // Commands are sent one at a time so each transcript stays in order
+    function sendNext() {
+        if (sshBusy || !sshQueue.length) {
+            return;
+        }
+        sshBusy = true;
+        var command = sshQueue.shift();
+        request(
+            "POST",
+            "/ssh",
+            [["command", command], ["session", session]].concat(
+                applianceFields()
+            ),
+            function (status, text) {
+                var output = status === 200 ? JSON.parse(text) : {};
+                appliances.forEach(function (appliance) {
+                    var textarea = $(
+                        "textarea[name='textarea_" + appliance.hostname + "']"
+                    );
+                    if (textarea) {
+                        textarea.value += output[appliance.hostname] ||
+                            ("Error: " + text + "\n");
+                    }
+                });
+                sshBusy = false;
+                sendNext();
+            }
+        );
+    }
+
+    $("input[name=sshCommandButton]").addEventListener("click", function () {
+        var input = $("input[name=sshCommand]");
+        sshQueue.push(input.value);
+        input.value = "";
+        sendNext();
+    });
+
+    //////////////////////////////////////////////////////////////////////
+    // Status charts
+
+    $("input[name=metrics]").addEventListener("click", function () {
+        var panel = $(".metricsPanel");
+        panel.style.display = panel.style.display === "none" ? "" : "none";
+    });
+
+    function draw(metric, canvas) {
+        var context = canvas.getContext("2d");
+        var series = window.statusData[metric];
+        context.clearRect(0, 0, canvas.width, canvas.height);
+        Object.keys(series).forEach(function (hostname) {
+            var points = series[hostname].slice(-60);
+            context.beginPath();
+            points.forEach(function (point, i) {
+                var x = i * canvas.width / 60;
+                var y = canvas.height - point[1] * canvas.height / 100;
+                if (i) {
+                    context.lineTo(x, y);
+                } else {
+                    context.moveTo(x, y);
+                }
+            });
+            context.stroke();
+        });
+    }
+
+    function chart(metric) {
+        var id = "status_" + metric + "_container";
+        if (document.getElementById(id)) {
+            return;
+        }
+        var container = document.createElement("div");
+        var title = document.createElement("h4");
+        var canvas = document.createElement("canvas");
+        container.id = id;
+        title.textContent = metric;
+        canvas.width = 400;
+        canvas.height = 100;
+        container.appendChild(title);
+        container.appendChild(canvas);
+        $(".charts").appendChild(container);
+        window.statusData[metric] = {};
+
+        function poll() {
+            request(
+                "GET",
+                "/status",
+                [["metric", metric]].concat(applianceFields()),
+                function (status, text) {
+                    if (status === 200) {
+                        var values = JSON.parse(text);
+                        var now = Date.now();
+                        Object.keys(values).forEach(function (hostname) {
+                            var series = window.statusData[metric];
+                            series[hostname] = series[hostname] || [];
+                            series[hostname].push([now, values[hostname]]);
+                        });
+                        draw(metric, canvas);
+                    }
+                    setTimeout(poll, 2000);
+                }
+            );
+        }
+        poll();
+    }
+
+    $("input[name=statusCharting]").addEventListener("click", function () {
+        $all(".metricsPanel input[type=checkbox]").forEach(function (box) {
+            if (box.checked) {
+                chart(box.value);
+            }
+        });
+    });
+
+    JSON.parse(window.localStorage.getItem("appliances") || "[]").forEach(
+        addAppliance
+    );
+    showTab("accounts");
+}());
@@ -0,0 +1,123 @@
+"""Shared resources for the tests, created the first time they are needed.
+
+A test asks for a fixture by naming it as a parameter, for instance
+``def list_domains(driver, hostnames):``. Each fixture is computed once
+from config.json (which is itself only read when a fixture needs it) and
+shared by every test. ``driver`` is the exception: each test gets a
+browser session of its own from the runner's pool, and browsers are only
+started when a test asking for one is about to run.
+"""
+import json
+import threading
+
+from mast_tests import naming
+from mast_tests.appliances import register_appliances
+from mast_tests.browser import start_driver, prepare_page
+from mast_tests.snapshot import Snapshot
+
+# Where the config fixture is read from, the CLI sets this from --config
+config_path = "config.json"
+
+# name -> function computing the fixture
+_fixtures = {}
+# name -> value, for fixtures which have been computed or overridden
+_values = {}
+_lock = threading.RLock()
+
+
+def fixture(func):
+    """Register func as the fixture named after it."""
+    _fixtures[func.__name__] = func
+    return func
+
+
+def get(name):
+    with _lock:
+        if name not in _values:
+            if name not in _fixtures:
+                raise KeyError("No fixture named {}".format(name))
+            _values[name] = _fixtures[name]()
+        return _values[name]
+
+
+def override(**values):
+    """Forget every computed fixture and use values for the given names."""
+    with _lock:
+        _values.clear()
+        _values.update(values)
+
+
+@fixture
+def config():
+    with open(config_path, "r") as fp:
+        return json.load(fp)
+
+
+@fixture
+def address():
+    return get("config")["address"]
+
+
+@fixture
+def appliances():
+    return get("config")["appliances"]
+
+
+@fixture
+def hostnames():
+    return [appliance["hostname"] for appliance in get("appliances")]
+
+
+@fixture
+def timeout():
+    return get("config").get("timeout", 30)
+
+
+@fixture
+def sessions():
+    return get("config").get("sessions", 1)
+
+
+@fixture
+def cache():
+    return get("config").get("cache", ".mast-cache")
+
+
+@fixture
+def browser_config():
+    return get("config").get("browser", {})
+
+
+@fixture
+def names():
+    return naming.from_config(get("config").get("namespace"))
+
+
+@fixture
+def ssh_config():
+    return get("config").get("ssh", {})
+
+
+@fixture
+def snapshot():
+    if not get("config").get("snapshot", True):
+        return None
+    return Snapshot(get("cache"), get("address"), get("appliances"))
+
+
+# Each session is a separate browser with its own appliance setup
+def start_session():
+    browser_config = get("browser_config")
+    appliances = get("appliances")
+    snapshot = get("snapshot")
+    driver = start_driver(browser_config)
+    driver.get(get("address"))
+    missing = appliances
+    if snapshot is not None:
+        missing = snapshot.restore(driver)
+    prepare_page(driver, browser_config)
+    if missing:
+        register_appliances(driver, missing)
+        if snapshot is not None:
+            snapshot.save(driver)
+    return driver
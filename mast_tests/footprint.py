@@ -0,0 +1,253 @@
+"""Record what each test costs the browser's page.
+
+Before a test the page is sampled and instrumented, after it the page is
+sampled again, through the browser's own APIs:
+
+* the JS heap in use (``performance.memory``, Chromium only)
+* the number of elements in the document
+* the number of event listeners on the window, the document and the
+  elements in it, counted by wrapping ``addEventListener`` and
+  ``removeEventListener`` the first time a page is sampled, so listeners
+  added while the page loaded are not included
+* the number and total duration of long tasks, over 50 ms each
+  (``PerformanceObserver``, Chromium only)
+
+What a test leaves behind is what it adds to these, a result table which
+is never cleared or an ``output_close`` which only hides its output shows
+up as elements and listeners which stay. The growth is added up for each
+tab too, the tab being the one the test declares with ``@test(tab=...)``.
+
+Turned on with --footprint or by the "footprint" section of config.json::
+
+    "footprint": {
+        "capture": true,
+        "heap_kb": 2048,
+        "nodes": 500,
+        "listeners": 50,
+        "long_task_ms": 250
+    }
+
+A test or tab growing the heap by more than heap_kb, the document by more
+than nodes elements or the listeners by more than listeners, or a test
+spending more than long_task_ms in long tasks, is logged as a warning.
+Without garbage collection between samples the heap is noisy, it is only
+collected first when the browser exposes ``window.gc``.
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+INSTALL_SCRIPT = """
+if (!window.__mastFootprint) {
+    var state = {listeners: new WeakMap(), longTasks: 0, longTaskMs: 0,
+                 observed: false};
+    var add = EventTarget.prototype.addEventListener;
+    var remove = EventTarget.prototype.removeEventListener;
+    var key = function (type, options) {
+        var capture = typeof options === "boolean" ? options :
+            !!(options && options.capture);
+        return type + (capture ? ":capture" : "");
+    };
+    EventTarget.prototype.addEventListener = function (type, listener,
+                                                       options) {
+        if (listener && !(options && options.once)) {
+            var types = state.listeners.get(this);
+            if (!types) {
+                types = {};
+                state.listeners.set(this, types);
+            }
+            var listeners = types[key(type, options)] =
+                types[key(type, options)] || [];
+            if (listeners.indexOf(listener) < 0) {
+                listeners.push(listener);
+            }
+        }
+        return add.apply(this, arguments);
+    };
+    EventTarget.prototype.removeEventListener = function (type, listener,
+                                                          options) {
+        var types = state.listeners.get(this);
+        var listeners = types && types[key(type, options)];
+        if (listeners && listeners.indexOf(listener) >= 0) {
+            listeners.splice(listeners.indexOf(listener), 1);
+        }
+        return remove.apply(this, arguments);
+    };
+    if (window.PerformanceObserver && (PerformanceObserver.supportedEntryTypes
+                                       || []).indexOf("longtask") >= 0) {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (entry) {
+                state.longTasks += 1;
+                state.longTaskMs += entry.duration;
+            });
+        }).observe({entryTypes: ["longtask"]});
+        state.observed = true;
+    }
+    window.__mastFootprint = state;
+}
+"""
+
+SAMPLE_SCRIPT = """
+var state = window.__mastFootprint;
+if (typeof window.gc === "function") {
+    window.gc();
+}
+var elements = document.getElementsByTagName("*");
+var listeners = null;
+if (state) {
+    listeners = 0;
+    [window, document].concat(Array.prototype.slice.call(elements))
+        .forEach(function (target) {
+            var types = state.listeners.get(target);
+            if (types) {
+                Object.keys(types).forEach(function (type) {
+                    listeners += types[type].length;
+                });
+            }
+        });
+}
+return {
+    instrumented: !!state,
+    heap: window.performance && performance.memory ?
+        performance.memory.usedJSHeapSize : null,
+    nodes: elements.length,
+    listeners: listeners,
+    long_tasks: state && state.observed ? state.longTasks : null,
+    long_task_ms: state && state.observed ? state.longTaskMs : null
+};
+"""
+
+# Measures which are compared between the samples before and after a test
+MEASURES = ("heap", "nodes", "listeners", "long_tasks", "long_task_ms")
+
+
+def _growth(before, after, measure):
+    if before[measure] is None or after[measure] is None:
+        return None
+    return after[measure] - before[measure]
+
+
+class FootprintMonitor(object):
+    """Samples the page of each test's session, see ``before`` and
+    ``after``. The runner calls these around every test given a driver.
+    tabs maps test names to the tab they exercise.
+    """
+    def __init__(self, heap_kb=2048, nodes=500, listeners=50,
+                 long_task_ms=250, tabs=None):
+        self.limits = OrderedDict([
+            ("heap", heap_kb * 1024),
+            ("nodes", nodes),
+            ("listeners", listeners),
+            ("long_task_ms", long_task_ms),
+        ])
+        self.tabs = dict(tabs or {})
+        # test name -> sample before it
+        self.baselines = {}
+        # test name -> OrderedDict of what it added
+        self.tests = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sample(self, driver, install=False):
+        return driver.execute_script(
+            (INSTALL_SCRIPT if install else "") + SAMPLE_SCRIPT
+        )
+
+    def before(self, driver, name):
+        """Instrument driver's page if it isn't already and sample it."""
+        sample = self._sample(driver, install=True)
+        with self._lock:
+            self.baselines[name] = sample
+
+    def after(self, driver, name):
+        """Sample driver's page and record what changed since before. A
+        page which was reloaded in between is instrumented afresh and only
+        its heap and elements are compared.
+        """
+        sample = self._sample(driver)
+        reloaded = not sample["instrumented"]
+        if reloaded:
+            sample = self._sample(driver, install=True)
+        with self._lock:
+            before = self.baselines.get(name)
+            if before is None:
+                return
+            record = OrderedDict([
+                ("name", name),
+                ("tab", self.tabs.get(name)),
+                ("reloaded", reloaded),
+            ])
+            for measure in MEASURES:
+                record[measure] = None if reloaded and measure in (
+                    "listeners", "long_tasks", "long_task_ms"
+                ) else _growth(before, sample, measure)
+            record["final_nodes"] = sample["nodes"]
+            record["final_heap"] = sample["heap"]
+            # The status chart monitor calls after on every sample, what
+            # it adds is counted from when it started
+            self.tests[name] = record
+
+    def _flags(self, growth):
+        return [
+            measure for measure, limit in self.limits.items()
+            if growth.get(measure) is not None and growth[measure] > limit
+        ]
+
+    def summary(self):
+        """What each test added, largest document growth first, and what
+        each tab's tests added between them.
+        """
+        with self._lock:
+            tests = [OrderedDict(record) for record in self.tests.values()]
+        tabs = OrderedDict()
+        for record in tests:
+            record["flags"] = self._flags(record)
+            tab = tabs.setdefault(record["tab"] or "(none)", OrderedDict(
+                [("tests", 0)] + [(measure, None) for measure in MEASURES]
+            ))
+            tab["tests"] += 1
+            # A reload starts the page over, it would hide what the tab's
+            # other tests added
+            if record["reloaded"]:
+                continue
+            for measure in MEASURES:
+                if record[measure] is not None:
+                    tab[measure] = (tab[measure] or 0) + record[measure]
+        for tab in tabs.values():
+            tab["flags"] = self._flags(tab)
+        tests.sort(key=lambda record: record["nodes"] or 0, reverse=True)
+        return {"tests": tests, "tabs": tabs}
+
+    def _describe(self, growth):
+        parts = []
+        if growth["heap"] is not None:
+            parts.append("heap {:+.1f} KB".format(growth["heap"] / 1024.0))
+        parts.append("{:+d} elements".format(growth["nodes"] or 0))
+        if growth["listeners"] is not None:
+            parts.append("{:+d} listeners".format(growth["listeners"]))
+        if growth["long_tasks"] is not None:
+            parts.append("{} long tasks ({:.0f} ms)".format(
+                growth["long_tasks"], growth["long_task_ms"] or 0.0
+            ))
+        return ", ".join(parts)
+
+    def log_summary(self, summary=None):
+        summary = self.summary() if summary is None else summary
+        for record in summary["tests"]:
+            log.info("Footprint {}: {}{}".format(
+                record["name"], self._describe(record),
+                " (page reloaded)" if record["reloaded"] else ""
+            ))
+            if record["flags"]:
+                log.warning("Footprint {}: grew beyond the limits for "
+                            "{}".format(record["name"],
+                                        ", ".join(record["flags"])))
+        for name, tab in summary["tabs"].items():
+            log.info("Footprint of the {} tab over {} tests: {}".format(
+                name, tab["tests"], self._describe(tab)
+            ))
+            if tab["flags"]:
+                log.warning("Footprint of the {} tab: grew beyond the limits "
+                            "for {}".format(name, ", ".join(tab["flags"])))
+        return summary
@@ -0,0 +1,172 @@
+"""Fill in MAST web forms with one injected script instead of one WebDriver
+command per keystroke and click.
+
+values map a field's name to what it should hold:
+
+* a string is typed into a text field, or picks the option of a select
+  with that value or visible text
+* a list picks those options of a multiple select, or checks the
+  checkboxes sharing the name with those values
+* True or False checks or unchecks a checkbox
+
+Every field changed gets the input and change events typing or clicking
+would have fired, so the page's handlers still run. Fields named in
+``typed`` are cleared and typed into with send_keys after the rest are
+filled, for tests which are about the keystrokes themselves.
+"""
+import logging
+
+from selenium.common.exceptions import TimeoutException
+
+from mast_tests.waits import Condition, wait_for
+
+log = logging.getLogger(__name__)
+
+# Defines fill(scope, values), which returns a list of the problems
+# stopping it from setting every field
+FILL_FUNCTION = """
+function fire(elem) {
+    ["input", "change"].forEach(function (type) {
+        elem.dispatchEvent(new Event(type, {bubbles: true}));
+    });
+}
+
+function matches(option, wanted) {
+    return wanted.indexOf(option.value) >= 0 ||
+        wanted.indexOf(option.text.trim()) >= 0;
+}
+
+function fill(scope, values) {
+    var problems = [];
+    var fields = Array.prototype.slice.call(scope.querySelectorAll("[name]"));
+    Object.keys(values).forEach(function (name) {
+        var value = values[name];
+        var wanted = (Array.isArray(value) ? value : [value]).map(String);
+        var elems = fields.filter(function (elem) {
+            return elem.getAttribute("name") === name;
+        });
+        if (!elems.length) {
+            problems.push(name + " not found");
+            return;
+        }
+        var elem = elems[0];
+        if (elem.tagName === "SELECT") {
+            var options = Array.prototype.slice.call(elem.options);
+            var missing = wanted.filter(function (w) {
+                return !options.some(function (o) { return matches(o, [w]); });
+            });
+            if (missing.length) {
+                problems.push(name + " has no option " + missing.join(", "));
+                return;
+            }
+            options.forEach(function (option) {
+                option.selected = matches(option, wanted);
+            });
+            fire(elem);
+        } else if (elem.type === "checkbox" || elem.type === "radio") {
+            elems.forEach(function (box) {
+                var on = typeof value === "boolean" ? value :
+                    wanted.indexOf(box.value) >= 0;
+                if (box.checked !== on) {
+                    box.checked = on;
+                    fire(box);
+                }
+            });
+        } else {
+            elem.value = wanted[0];
+            fire(elem);
+        }
+    });
+    return problems;
+}
+"""
+
+FILL_SCRIPT = FILL_FUNCTION + """
+return fill(arguments[0] || document, arguments[1]);
+"""
+
+FILL_EACH_SCRIPT = FILL_FUNCTION + """
+var scope = arguments[0] || document, rows = arguments[1];
+var button = scope.querySelector(arguments[2]);
+var problems = [];
+rows.forEach(function (values) {
+    problems = problems.concat(fill(scope, values));
+    button.click();
+});
+return problems;
+"""
+
+CHECKBOXES_SCRIPT = """
+var scope = arguments[0] || document, values = arguments[1];
+var checked = arguments[2], changed = [];
+scope.querySelectorAll("input[type=checkbox]").forEach(function (box) {
+    if (values !== null && values.indexOf(box.value) < 0) {
+        return;
+    }
+    if (box.checked !== checked) {
+        box.checked = checked;
+        ["input", "change"].forEach(function (type) {
+            box.dispatchEvent(new Event(type, {bubbles: true}));
+        });
+        changed.push(box.value);
+    }
+});
+return changed;
+"""
+
+
+def fill(driver, form, values, typed=(), timeout=None):
+    """Set every field of form (a WebElement, None for the whole page) in
+    values at once, waiting for any select whose options haven't loaded
+    yet. The fields of values named in typed are typed into instead.
+
+    Returns form.
+    """
+    problems = []
+    scripted = dict((name, value) for name, value in values.items()
+                    if name not in typed)
+
+    def check(driver):
+        problems[:] = driver.execute_script(FILL_SCRIPT, form, scripted)
+        return not problems
+
+    try:
+        wait_for(driver, Condition(check, "form fields {}".format(
+            ", ".join(sorted(scripted))
+        )), timeout=timeout)
+    except TimeoutException:
+        raise TimeoutException("Unable to fill in the form: {}".format(
+            "; ".join(problems)
+        ))
+    for name in typed:
+        log.debug("Typing into {}".format(name))
+        field = (form or driver).find_element_by_name(name)
+        field.clear()
+        field.send_keys(values[name])
+    return form
+
+
+def fill_each(driver, form, rows, button):
+    """Fill in form with each of rows in turn, clicking the element
+    matching the CSS selector button after each, all in one script.
+    """
+    problems = driver.execute_script(FILL_EACH_SCRIPT, form, rows, button)
+    if problems:
+        raise AssertionError("Unable to fill in the form: {}".format(
+            "; ".join(problems)
+        ))
+
+
+def set_checkboxes(driver, scope=None, values=None, checked=True):
+    """Check (or uncheck) every checkbox in scope (a WebElement, None for
+    the whole page), or only those with one of values. Returns the values
+    of the checkboxes which changed.
+    """
+    changed = driver.execute_script(
+        CHECKBOXES_SCRIPT, scope, None if values is None else list(values),
+        checked
+    )
+    log.debug("{} checkboxes {}".format(
+        "Checked" if checked else "Unchecked", ", ".join(changed) or "none"
+    ))
+    return changed
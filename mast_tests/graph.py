@@ -0,0 +1,110 @@
+"""Dependency graph derived from the resources each test declares.
+
+Resources are plain strings such as ``"domain:demo"``. For every resource:
+
+* tests which read or destroy it require the tests which create it, and
+  are skipped if any of those did not pass
+* tests which destroy it also wait for every test which reads it, but still
+  run if a reader failed so that the resource is cleaned up
+"""
+from collections import OrderedDict, defaultdict
+
+
+class Graph(object):
+    def __init__(self, tests):
+        self.tests = OrderedDict((t.name, t) for t in tests)
+        # name -> names which must pass first
+        self.requires = dict((name, set()) for name in self.tests)
+        # name -> names which must finish first (a superset of requires)
+        self.after = dict((name, set()) for name in self.tests)
+
+        creators = defaultdict(list)
+        readers = defaultdict(list)
+        destroyers = defaultdict(list)
+        for t in self.tests.values():
+            for resource in t.creates:
+                creators[resource].append(t.name)
+            for resource in t.reads:
+                readers[resource].append(t.name)
+            for resource in t.destroys:
+                destroyers[resource].append(t.name)
+
+        for resource, names in creators.items():
+            for name in readers[resource] + destroyers[resource]:
+                self.requires[name].update(n for n in names if n != name)
+        for resource, names in destroyers.items():
+            for name in names:
+                self.after[name].update(
+                    n for n in readers[resource] if n != name
+                )
+        for name in self.tests:
+            self.after[name] |= self.requires[name]
+
+        self.order = self._sort()
+
+    def _sort(self):
+        """Names in an order which satisfies every edge, keeping
+        declaration order where the graph allows it.
+        """
+        order = []
+        placed = set()
+        pending = list(self.tests)
+        while pending:
+            for name in pending:
+                if self.after[name] <= placed:
+                    break
+            else:
+                raise ValueError(
+                    "Circular dependency between tests {}".format(
+                        ", ".join(pending)
+                    )
+                )
+            pending.remove(name)
+            placed.add(name)
+            order.append(name)
+        return order
+
+    def ancestors(self, name):
+        """Every test name needs to pass before it can run."""
+        seen = set()
+        stack = [name]
+        while stack:
+            for required in self.requires[stack.pop()]:
+                if required not in seen:
+                    seen.add(required)
+                    stack.append(required)
+        return seen
+
+    def rerun_plan(self, name, teardown=True):
+        """The smallest list of tests which re-runs name.
+
+        With teardown, tests destroying what the plan creates are included
+        (along with anything they require) so the appliances are left as
+        they were found.
+        """
+        return self.plan([name], teardown)
+
+    def plan(self, names, teardown=True):
+        """The smallest list of tests which re-runs every test in names,
+        see ``rerun_plan``.
+        """
+        selected = set()
+        for name in names:
+            if name not in self.tests:
+                raise KeyError("Unknown test {}".format(name))
+            selected |= self.ancestors(name) | set([name])
+        while teardown:
+            created = set()
+            for n in selected:
+                created.update(self.tests[n].creates)
+            extra = set()
+            for t in self.tests.values():
+                if t.name in selected:
+                    continue
+                if created.intersection(t.destroys) and \
+                        self.ancestors(t.name) <= selected:
+                    extra.add(t.name)
+            if not extra:
+                break
+            selected |= extra
+        return [self.tests[n] for n in self.order if n in selected]
@@ -0,0 +1,101 @@
+"""A stand-in for a Selenium Grid on this machine.
+
+Each node is a geckodriver or chromedriver process listening on a port of
+its own, which a remote driver can talk to just as it would to a Grid.
+geckodriver only holds one session at a time, so a node is started for
+every browser session the run may need::
+
+    with LocalGrid("firefox", 4) as grid:
+        ...  # grid.urls are the nodes' addresses
+
+The driver executables have to be on the PATH.
+"""
+import logging
+import shutil
+import subprocess
+from time import time, sleep
+from urllib.request import urlopen
+
+log = logging.getLogger(__name__)
+
+EXECUTABLES = {
+    "firefox": "geckodriver",
+    "chromium": "chromedriver",
+    "chrome": "chromedriver",
+}
+
+
+def _command(executable, port):
+    if executable == "geckodriver":
+        return [executable, "--host", "127.0.0.1", "--port", str(port)]
+    return [executable, "--port={}".format(port)]
+
+
+class LocalGrid(object):
+    def __init__(self, browser, nodes, port=4444, timeout=30):
+        if browser not in EXECUTABLES:
+            raise ValueError("Unsupported browser {}".format(browser))
+        self.executable = EXECUTABLES[browser]
+        self.nodes = nodes
+        self.port = port
+        self.timeout = timeout
+        self.processes = []
+        self.urls = []
+
+    def start(self):
+        """Start every node and wait for each to be ready."""
+        path = shutil.which(self.executable)
+        if path is None:
+            raise RuntimeError("{} is not on the PATH".format(self.executable))
+        start = time()
+        for port in range(self.port, self.port + self.nodes):
+            self.processes.append(subprocess.Popen(
+                _command(path, port),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            ))
+            self.urls.append("http://127.0.0.1:{}".format(port))
+        try:
+            for url, process in zip(self.urls, self.processes):
+                self._wait(url, process)
+        except Exception:
+            self.stop()
+            raise
+        log.info("Started {} local grid nodes on ports {}-{} in {:.3f}s".format(
+            self.nodes, self.port, self.port + self.nodes - 1, time() - start
+        ))
+        return self
+
+    def _wait(self, url, process):
+        deadline = time() + self.timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError("Grid node {} exited with {}".format(
+                    url, process.returncode
+                ))
+            try:
+                with urlopen(url + "/status", timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except OSError:
+                pass
+            if time() > deadline:
+                raise RuntimeError("Grid node {} did not start".format(url))
+            sleep(0.1)
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.processes = []
+        self.urls = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,186 @@
+"""Remember how each test went from one run to the next.
+
+After every run of the browser tests, each test's outcome, duration and
+fingerprint are saved to ``<cache>/results.json``, merged with what was
+saved before for the tests which didn't run. A test's fingerprint covers
+everything which would make it behave differently: the address, the
+appliances and browser settings in config.json, the fixtures it asks for
+and its own code.
+
+``--failed`` then runs only the tests which didn't pass last time and
+``--changed`` only those whose fingerprint is not the one they last ran
+with, each along with the tests they depend on and those which clean up
+after them.
+
+Runs sharing a cache can finish together, so saving takes a lock file
+next to the history, reads what is there by then and only replaces the
+entries of the tests which ran.
+"""
+import os
+import json
+import errno
+import hashlib
+import inspect
+import logging
+import tempfile
+from contextlib import contextmanager
+from time import time, sleep
+
+from mast_tests.runner import PASSED, SKIPPED
+
+log = logging.getLogger(__name__)
+
+# Fixtures which differ every run without changing what a test checks
+UNTRACKED = ("driver", "names")
+
+# Seconds to wait for another run to save its history, and after which a
+# lock is taken to have been left behind by a run which died while saving
+LOCK_TIMEOUT = 30
+
+
+def history_path(cache):
+    return os.path.join(cache, "results.json")
+
+
+def fingerprint(test, config, resolve):
+    """A key which changes whenever test's setup or code does. resolve is
+    called with the name of each fixture test asks for.
+    """
+    data = json.dumps({
+        "address": config.get("address"),
+        "appliances": config.get("appliances"),
+        "browser": config.get("browser", {}),
+        "fixtures": dict(
+            (name, resolve(name)) for name in test.params
+            if name not in UNTRACKED
+        ),
+        "code": inspect.getsource(test.func),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprints(tests, config, resolve):
+    return dict((t.name, fingerprint(t, config, resolve)) for t in tests)
+
+
+class History(object):
+    """What happened to each test the last time it ran, read from path.
+    Given known, the names of the tests there are now, entries for tests
+    which no longer exist are dropped.
+    """
+    def __init__(self, path, known=None):
+        self.path = path
+        self.known = None if known is None else set(known)
+        # test name -> what happened the last time it ran
+        self.tests = self._load()
+
+    def _load(self):
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path) as fp:
+                tests = json.load(fp)["tests"]
+        except (ValueError, KeyError):
+            log.exception("Ignoring unreadable test history {}".format(
+                self.path
+            ))
+            return {}
+        if self.known is not None:
+            tests = dict((name, entry) for name, entry in tests.items()
+                         if name in self.known)
+        return tests
+
+    @contextmanager
+    def _locked(self):
+        """Hold the history's lock file, breaking one older than
+        LOCK_TIMEOUT.
+        """
+        lock = self.path + ".lock"
+        deadline = time() + LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+            try:
+                stale = time() - os.path.getmtime(lock) > LOCK_TIMEOUT
+            except OSError:
+                # Released in the meantime
+                continue
+            if stale or time() > deadline:
+                log.warning("Breaking the lock on test history {}".format(
+                    self.path
+                ))
+                try:
+                    os.remove(lock)
+                except OSError:
+                    pass
+                continue
+            sleep(0.05)
+        try:
+            os.close(fd)
+            yield
+        finally:
+            os.remove(lock)
+
+    def failed(self, tests):
+        """The names of tests which didn't pass the last time they ran."""
+        return [t.name for t in tests if t.name in self.tests and
+                self.tests[t.name]["status"] != PASSED]
+
+    def changed(self, tests, fingerprints):
+        """The names of tests which never ran or whose fingerprint is not
+        the one they last ran with.
+        """
+        return [t.name for t in tests if
+                self.tests.get(t.name, {}).get("fingerprint") !=
+                fingerprints[t.name]]
+
+    def duration(self, names):
+        """Seconds the tests in names took the last time they ran."""
+        return sum(self.tests[name]["duration"] for name in names
+                   if name in self.tests)
+
+    def update(self, results, fingerprints):
+        """Record results for the tests in fingerprints and save, on top of
+        whatever other runs saved since this history was read. A skipped
+        test keeps the fingerprint it last ran with.
+        """
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with self._locked():
+            self.tests = self._load()
+            self._record(results, fingerprints)
+            self.save()
+
+    def _record(self, results, fingerprints):
+        for name, key in fingerprints.items():
+            if name not in results:
+                continue
+            result = results[name]
+            previous = self.tests.get(name, {})
+            self.tests[name] = {
+                "status": result.status,
+                "duration": round(result.duration, 3),
+                "attempts": result.attempts,
+                "error": None if result.error is None else str(result.error),
+                "fingerprint": previous.get("fingerprint")
+                if result.status == SKIPPED else key,
+                "finished": time(),
+            }
+
+    def save(self):
+        """Replace the saved history with this one, see update to merge
+        with it instead.
+        """
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+        with os.fdopen(fd, "w") as fp:
+            json.dump({"tests": self.tests}, fp, indent=4, sort_keys=True)
+        os.replace(tmp, self.path)
+        log.info("Saved test history {}".format(self.path))
@@ -0,0 +1,177 @@
+"""Where things are on the MAST web page.
+
+Locators are (by, value) tuples keyed by tab and form name, resolving to
+ID and CSS selectors rather than absolute XPaths. find() caches the
+elements it resolves for each driver and only looks them up again once
+they go stale, and records how long every lookup took. Lookups and the
+calls made on cached elements, such as clicks, are also recorded as spans
+of the current test.
+"""
+import logging
+import threading
+from time import time
+from weakref import WeakKeyDictionary
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+
+from mast_tests.report import recorder
+
+log = logging.getLogger(__name__)
+
+TABS = [
+    "accounts",
+    "backups",
+    "crypto",
+    "deployment",
+    "developer",
+    "network",
+    "ssh",
+    "status",
+    "system",
+]
+
+# MAST web gives its tab containers no IDs or classes to find them by,
+# they follow each other in the order of TABS within the third div of the
+# body, and a tab's output pane is in the third cell of its table
+TAB_CONTAINER = "body > div:nth-of-type(3) > div > div:nth-of-type({})"
+RESULTS = (TAB_CONTAINER + " > table > tbody > tr > td:nth-of-type(3)"
+           " > pre > div")
+
+
+def tab(name):
+    return (By.LINK_TEXT, name)
+
+
+def action(label):
+    """The button on a tab which opens the form for label."""
+    return (By.ID, label)
+
+
+def form(name):
+    return (By.CSS_SELECTOR, "[name='{}']".format(name))
+
+
+def field(form_name, name):
+    return (By.CSS_SELECTOR, "[name='{}'] [name='{}']".format(form_name, name))
+
+
+def multitext_box(form_name):
+    return (By.CSS_SELECTOR, "[name='{}'] .multiTextTextbox".format(form_name))
+
+
+def multitext_button(form_name):
+    return (By.CSS_SELECTOR, "[name='{}'] .multiTextButton".format(form_name))
+
+
+def results(tab_name):
+    """The output pane of a tab."""
+    if tab_name not in TABS:
+        raise ValueError("Unknown tab {}".format(tab_name))
+    return (By.CSS_SELECTOR, RESULTS.format(TABS.index(tab_name) + 1))
+
+
+##############################################################################
+# Cached lookups
+##############################################################################
+
+# driver -> (locator, index) -> CachedElement
+_cache = WeakKeyDictionary()
+_lock = threading.Lock()
+# locator description -> [lookups, cache hits, seconds spent looking up]
+_timings = {}
+
+
+def _describe(locator, index):
+    description = "{} {}".format(*locator)
+    if index is not None:
+        description += "[{}]".format(index)
+    return description
+
+
+def _record(description, lookups=0, hits=0, seconds=0.0):
+    with _lock:
+        timing = _timings.setdefault(description, [0, 0, 0.0])
+        timing[0] += lookups
+        timing[1] += hits
+        timing[2] += seconds
+
+
+class CachedElement(object):
+    """Stands in for a WebElement, resolving it again if it goes stale."""
+    def __init__(self, resolve, description):
+        self._resolve = resolve
+        self._description = description
+        self._element = resolve()
+
+    def _retry(self, func):
+        try:
+            return func(self._element)
+        except StaleElementReferenceException:
+            self._element = self._resolve()
+            return func(self._element)
+
+    def __getattr__(self, name):
+        attr = self._retry(lambda element: getattr(element, name))
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with recorder.span("{} {}".format(name, self._description)):
+                return self._retry(
+                    lambda element: getattr(element, name)(*args, **kwargs)
+                )
+        return call
+
+
+def find(driver, locator, index=None):
+    """The element at locator, or the index'th match when index is given."""
+    key = (locator, index)
+    description = _describe(locator, index)
+    with _lock:
+        elements = _cache.setdefault(driver, {})
+        cached = elements.get(key)
+    if cached is not None:
+        _record(description, hits=1)
+        return cached
+
+    def resolve():
+        start = time()
+        try:
+            if index is None:
+                return driver.find_element(*locator)
+            matches = driver.find_elements(*locator)
+            if len(matches) <= index:
+                raise NoSuchElementException(
+                    "Unable to locate {}".format(description)
+                )
+            return matches[index]
+        finally:
+            seconds = time() - start
+            _record(description, lookups=1, seconds=seconds)
+            recorder.add("find " + description, seconds)
+
+    cached = CachedElement(resolve, description)
+    with _lock:
+        elements[key] = cached
+    return cached
+
+
+def timings():
+    """(description, lookups, cache hits, seconds) for every locator used,
+    slowest first.
+    """
+    with _lock:
+        rows = [(description,) + tuple(timing)
+                for description, timing in _timings.items()]
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+def log_timings():
+    for description, lookups, hits, seconds in timings():
+        log.debug("Locator {}: {} lookups ({:.3f}s), {} cache hits".format(
+            description, lookups, seconds, hits
+        ))
@@ -0,0 +1,177 @@
+"""Logging which keeps I/O off the threads running the tests.
+
+configure() attaches a QueueHandler to the loggers it is given, so logging
+a record only puts it on a queue. A single background listener formats the
+records and writes them to stdout and/or a file. It flushes whenever the
+queue runs dry, or after every ``batch`` records while it is busy, rather
+than after every record.
+
+Configured by the "logging" section of config.json::
+
+    "logging": {
+        "level": 10,
+        "stdout": true,
+        "filename": "ui-tests.log",
+        "mode": "w",
+        "format": "json",
+        "batch": 100
+    }
+
+format is "text" (the default) for the 'key'='value' lines, or "json" for
+one compact JSON object per line.
+"""
+import copy
+import json
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue, Empty
+
+from mast_tests.report import recorder
+
+STDOUT_FORMAT = "[%(relativeCreated)s] %(levelname)s: %(message)s"
+
+FILE_FORMAT = "; ".join((
+    "'level'='%(levelname)s'",
+    "'datetime'='%(asctime)s'",
+    "'process_name'='%(processName)s'",
+    "'pid'='%(process)d'",
+    "'thread'='%(thread)d'",
+    "'module'='%(module)s'",
+    "'line'='%(lineno)d'",
+    "'message'='%(message)s'",
+))
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "time": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "test": getattr(record, "test", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, separators=(",", ":"))
+
+
+class TestFilter(logging.Filter):
+    """Tag each record with the test running on the thread which logged
+    it, the listener formats records on a thread of its own.
+    """
+    def filter(self, record):
+        record.test = recorder.current_test
+        return True
+
+
+class RecordQueueHandler(QueueHandler):
+    """Queues records with the message and any traceback kept apart, so
+    the listener's formatters can place the traceback themselves (the
+    JSON formatter in its own field).
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+        # Tracebacks hold on to every frame's locals
+        record.exc_info = None
+        return record
+
+
+class _Buffered(object):
+    """Write records without flushing after each one, flushing after every
+    batch records instead. The listener flushes the rest once it is idle.
+    """
+    batch = 100
+    _pending = 0
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            if self._pending >= self.batch:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self._pending = 0
+        super(_Buffered, self).flush()
+
+
+class BufferedStreamHandler(_Buffered, logging.StreamHandler):
+    pass
+
+
+class BufferedFileHandler(_Buffered, logging.FileHandler):
+    pass
+
+
+class BatchingQueueListener(QueueListener):
+    """Flushes its handlers whenever the queue runs dry."""
+    def dequeue(self, block):
+        try:
+            return self.queue.get(block=False)
+        except Empty:
+            if not block:
+                raise
+        for handler in self.handlers:
+            handler.flush()
+        return self.queue.get(block=True)
+
+    def stop(self):
+        super(BatchingQueueListener, self).stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+def configure(config, loggers):
+    """Send the named loggers' records through a queue to the handlers
+    config asks for. Returns the listener, which is stopped (writing out
+    anything still queued) at exit.
+    """
+    level = config["level"]
+    json_lines = config.get("format", "text") == "json"
+    handlers = []
+    if config.get("stdout"):
+        handler = BufferedStreamHandler()
+        handler.setFormatter(
+            JSONFormatter() if json_lines
+            else logging.Formatter(STDOUT_FORMAT)
+        )
+        handlers.append(handler)
+    if "filename" in config:
+        handler = BufferedFileHandler(filename=config["filename"],
+                                      mode=config.get("mode", "a"))
+        handler.setFormatter(
+            JSONFormatter() if json_lines else logging.Formatter(FILE_FORMAT)
+        )
+        handlers.append(handler)
+    for handler in handlers:
+        handler.setLevel(level)
+        handler.batch = config.get("batch", _Buffered.batch)
+
+    queue = Queue()
+    queue_handler = RecordQueueHandler(queue)
+    queue_handler.addFilter(TestFilter())
+    for name in loggers:
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        logger.addHandler(queue_handler)
+    listener = BatchingQueueListener(queue, *handlers,
+                                     respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,286 @@
+"""Watch the status charts for the whole of a run.
+
+The status tab is the screen left open for hours in operations, so a
+ChartMonitor opens it in a browser session of its own, starts charting
+every metric and samples the charts in the background while the tests run.
+For each metric it records how often the chart updates and the longest
+gap between updates, and it tracks the browser's memory. A chart which
+stops updating, or memory which keeps growing, fails the monitor. A run
+over before the monitor took its first sample tells nothing either way,
+the monitor is then skipped.
+
+Turned on with --monitor or by the "monitor" section of config.json::
+
+    "monitor": {
+        "capture": true,
+        "interval": 5,
+        "stall": 30,
+        "leak": 100
+    }
+
+interval is how often to sample in seconds, stall is how long a chart may
+go without updating in seconds and leak is how fast, in MB per hour, the
+browser's memory may grow (judged once it has been running for 15
+minutes).
+"""
+import logging
+import threading
+from time import time
+
+from mast_tests import locators
+from mast_tests.browser import current_memory
+from mast_tests.forms import set_checkboxes
+from mast_tests.locators import find
+from mast_tests.runner import Result, PASSED, FAILED, SKIPPED
+from mast_tests.waits import wait_for, element_visible
+
+log = logging.getLogger(__name__)
+
+METRICS = [
+    "CPUUsage.tenSeconds",
+    "MemoryStatus.Usage",
+    "TCPSummary.established",
+    "FilesystemStatus.FreeTemporary",
+    "FilesystemStatus.FreeEncrypted",
+    "FilesystemStatus.FreeInternal",
+    "SystemUsage.Load",
+    "SystemUsage.WorkList",
+]
+
+# Memory growth is only judged once the monitor has been sampling for this
+# many seconds, so a browser warming up isn't taken for a leak
+LEAK_WINDOW = 15 * 60
+
+# For each metric, the number of points and latest timestamp in
+# window.statusData where the page keeps one, and a hash of whatever is
+# drawn in the chart's container otherwise
+SAMPLE_SCRIPT = """
+function hash(text) {
+    var h = 0;
+    for (var i = 0; i < text.length; i++) {
+        h = (h * 31 + text.charCodeAt(i)) | 0;
+    }
+    return h;
+}
+function pane(metric) {
+    return "status_" + metric + "_container";
+}
+var result = {metrics: {}, heap: null};
+arguments[0].forEach(function (metric) {
+    var container = document.getElementById(pane(metric));
+    var sample = {exists: !!container, points: null, last: null,
+                  fingerprint: null};
+    var series = window.statusData && window.statusData[metric];
+    if (series) {
+        sample.points = 0;
+        Object.keys(series).forEach(function (hostname) {
+            var points = series[hostname];
+            sample.points += points.length;
+            if (points.length) {
+                sample.last = Math.max(sample.last || 0,
+                                       points[points.length - 1][0]);
+            }
+        });
+    }
+    if (container) {
+        var canvas = container.querySelector("canvas");
+        sample.fingerprint = hash(
+            canvas ? canvas.toDataURL() : container.innerHTML
+        );
+    }
+    result.metrics[metric] = sample;
+});
+if (window.performance && window.performance.memory) {
+    result.heap = window.performance.memory.usedJSHeapSize;
+}
+return result;
+"""
+
+
+def pane(metric):
+    return "status_{}_container".format(metric)
+
+
+def start_charting(driver, metrics=None):
+    """Open the status tab and start charting metrics, or every metric on
+    offer when metrics is None.
+    """
+    find(driver, locators.tab("status")).click()
+    wait_for(driver, element_visible(locators.form("metrics"))).click()
+    set_checkboxes(driver, values=metrics)
+    driver.find_element_by_name("metrics").click()
+    log.info("Starting the status chart")
+    driver.find_element_by_name("statusCharting").click()
+
+
+def slope(points):
+    """Least squares slope of a list of (x, y)."""
+    if len(points) < 2:
+        return 0.0
+    n = float(len(points))
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+class ChartMonitor(object):
+    """Sample the status charts in a session from factory until stopped.
+
+    close is called with the session's driver once the monitor stops.
+    Each of watchers (see ``mast_tests.runner.run``) sees the session as
+    if it were a test named "status_charts", ``after`` being called on
+    every sample.
+    """
+    name = "status_charts"
+
+    def __init__(self, factory, close=None, metrics=METRICS, interval=5,
+                 stall=30, leak=100, watchers=()):
+        self.factory = factory
+        self.watchers = list(watchers)
+        self._close = close or (lambda driver: driver.quit())
+        self.metrics = list(metrics)
+        self.interval = interval
+        self.stall = stall
+        self.leak = leak
+        # metric -> [(time, points, fingerprint)]
+        self.samples = dict((metric, []) for metric in self.metrics)
+        # [(time, resident bytes, js heap bytes)]
+        self.memory = []
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+
+    def start(self):
+        self._started = time()
+        self._thread = threading.Thread(target=self._run, name=self.name)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            driver = self.factory()
+        except Exception as e:
+            log.exception("Unable to start the status chart monitor")
+            self.error = e
+            return
+        try:
+            for watcher in self.watchers:
+                watcher.before(driver, self.name)
+            start_charting(driver, self.metrics)
+            while not self._stop.is_set():
+                self.sample(driver)
+                self._stop.wait(self.interval)
+        except Exception as e:
+            log.exception("Status chart monitor failed")
+            self.error = e
+        finally:
+            try:
+                self._close(driver)
+            except Exception:
+                log.exception("Unable to close the status chart monitor")
+
+    def sample(self, driver):
+        now = time()
+        data = driver.execute_script(SAMPLE_SCRIPT, self.metrics)
+        for metric, sample in data["metrics"].items():
+            if sample["exists"]:
+                self.samples[metric].append(
+                    (now, sample["points"], sample["fingerprint"])
+                )
+        self.memory.append((now, current_memory(driver), data["heap"]))
+        for watcher in self.watchers:
+            try:
+                watcher.after(driver, self.name)
+            except Exception:
+                log.exception("{}.after failed for the status chart "
+                              "monitor".format(type(watcher).__name__))
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def summary(self):
+        """Update rate, longest gap and whether it stalled for each metric,
+        along with memory growth.
+        """
+        end = time()
+        metrics = {}
+        for metric, samples in self.samples.items():
+            updates = []
+            for previous, sample in zip(samples, samples[1:]):
+                if sample[1:] != previous[1:]:
+                    updates.append(sample[0])
+            # A chart which never appeared counts as stalled from the start,
+            # unless the monitor never got to look for it
+            marks = [samples[0][0] if samples else self._started]
+            marks += updates + [end]
+            gap = max(b - a for a, b in zip(marks, marks[1:]))
+            span = (samples[-1][0] - samples[0][0]) if samples else 0
+            metrics[metric] = {
+                "samples": len(samples),
+                "updates": len(updates),
+                "updates_per_minute": round(len(updates) * 60.0 / span, 3)
+                if span else 0.0,
+                "longest_gap": round(gap, 3),
+                "stalled": bool(self.memory) and (
+                    not samples or gap > self.stall
+                ),
+            }
+        memory = {}
+        for index, key in ((1, "resident"), (2, "heap")):
+            points = [(sample[0], sample[index]) for sample in self.memory
+                      if sample[index] is not None]
+            if not points:
+                continue
+            per_hour = slope(points) * 3600 / 1024.0 / 1024.0
+            memory[key] = {
+                "first_mb": round(points[0][1] / 1024.0 / 1024.0, 1),
+                "last_mb": round(points[-1][1] / 1024.0 / 1024.0, 1),
+                "mb_per_hour": round(per_hour, 1),
+                "leaking": (points[-1][0] - points[0][0] >= LEAK_WINDOW
+                            and per_hour > self.leak),
+            }
+        return {"metrics": metrics, "memory": memory,
+                "sampled": len(self.memory)}
+
+    def result(self):
+        """The monitor's findings as a runner Result."""
+        duration = time() - self._started
+        summary = self.summary()
+        problems = []
+        for metric, stats in sorted(summary["metrics"].items()):
+            log.info("Status chart {}: {} updates ({} per minute), longest "
+                     "gap {}s".format(metric, stats["updates"],
+                                      stats["updates_per_minute"],
+                                      stats["longest_gap"]))
+            if stats["stalled"]:
+                problems.append("{} stalled for {}s".format(
+                    metric, stats["longest_gap"]
+                ))
+        for key, stats in sorted(summary["memory"].items()):
+            log.info("Status chart browser {} memory {} MB -> {} MB "
+                     "({} MB per hour)".format(key, stats["first_mb"],
+                                               stats["last_mb"],
+                                               stats["mb_per_hour"]))
+            if stats["leaking"]:
+                problems.append("{} memory grew {} MB per hour".format(
+                    key, stats["mb_per_hour"]
+                ))
+        if self.error is not None:
+            return Result(self.name, FAILED, duration, self.error)
+        if not self.memory:
+            log.warning("Status chart monitor stopped before its first "
+                        "sample")
+            return Result(self.name, SKIPPED, duration)
+        if problems:
+            for problem in problems:
+                log.error("Status chart monitor: {}".format(problem))
+            return Result(self.name, FAILED, duration,
+                          AssertionError("; ".join(problems)))
+        return Result(self.name, PASSED, duration)
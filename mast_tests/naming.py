@@ -0,0 +1,77 @@
+"""Names for what the tests create on the appliances.
+
+Every name is the run's prefix followed by the name the tests were written
+with, so runs (and the workers of a run) sharing appliances each work on a
+domain, group, user and directory of their own. The prefix comes from the
+"namespace" key of config.json: leave it out for a new prefix every run,
+set it to use that prefix (followed by the worker's number, if the run is
+split) or set it to "" to use the plain names.
+
+The resources tests declare (``"domain:demo"`` and so on) keep the plain
+names, they only say how the tests depend on each other.
+"""
+import os
+import random
+import string
+
+# Set for each worker when a run is split across several processes
+WORKER_VARIABLE = "MAST_TESTS_WORKER"
+
+_ALPHABET = string.ascii_lowercase + string.digits
+
+
+def worker_suffix():
+    """Distinguishes this worker's names from the other workers' in the
+    same run, empty when the run isn't split.
+    """
+    worker = os.environ.get(WORKER_VARIABLE, "")
+    return "w{}".format(worker) if worker else ""
+
+
+def run_prefix():
+    """A new prefix, unique enough that concurrent runs won't share it.
+
+    DataPower object names are limited to letters, digits and a few
+    punctuation characters, so the prefix is a letter followed by letters
+    and digits only.
+    """
+    token = "".join(random.SystemRandom().choice(_ALPHABET) for _ in range(5))
+    return "t{}{}".format(token, worker_suffix())
+
+
+def from_config(namespace):
+    """Names for the "namespace" setting in config.json, None meaning a new
+    prefix for this run.
+    """
+    if namespace is None:
+        return Names(run_prefix())
+    if namespace:
+        return Names(namespace + worker_suffix())
+    return Names()
+
+
+class Names(object):
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+
+    def __call__(self, name):
+        return "{}{}".format(self.prefix, name)
+
+    @property
+    def domain(self):
+        return self("demo")
+
+    @property
+    def group(self):
+        return self("demoRO")
+
+    @property
+    def user(self):
+        return self("demoTest")
+
+    @property
+    def directory(self):
+        return "local:///ondisk/{}".format(self("SimpleStatus"))
+
+    def __repr__(self):
+        return "<Names {!r}>".format(self.prefix)
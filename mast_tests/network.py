@@ -0,0 +1,139 @@
+"""Record the traffic between the browser and MAST web for each test.
+
+Uses the browser's Resource Timing API, which Firefox and Chromium both
+offer, so no proxy or browser specific logging is needed. Every request
+the page makes (the form posts, the status chart polling, the scripts and
+styles) is recorded with the endpoint it went to, the bytes which came
+back and how long it took.
+
+Turned on with --network or by the "network" section of config.json::
+
+    "network": {
+        "capture": true,
+        "large_kb": 512,
+        "chatty": 50
+    }
+
+A test which receives a response bigger than large_kb, or makes more than
+chatty requests, is logged as a warning.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+log = logging.getLogger(__name__)
+
+# Plenty for a single test, the status chart monitor collects as it goes
+BUFFER_SIZE = 10000
+
+BEGIN_SCRIPT = """
+performance.setResourceTimingBufferSize(arguments[0]);
+performance.clearResourceTimings();
+"""
+
+TAKE_SCRIPT = """
+var entries = performance.getEntriesByType("resource").map(function (e) {
+    return {
+        url: e.name,
+        type: e.initiatorType,
+        duration: e.duration,
+        wait: e.responseStart > 0 ? e.responseStart - e.requestStart : null,
+        transfer: e.transferSize || 0,
+        body: e.encodedBodySize || 0,
+        decoded: e.decodedBodySize || 0
+    };
+});
+performance.clearResourceTimings();
+return entries;
+"""
+
+
+def endpoint(url):
+    """The path a request went to, without the address or query string."""
+    return urlparse(url).path or "/"
+
+
+class NetworkCapture(object):
+    """Collects the requests each test's session makes, see ``before`` and
+    ``after``. The runner calls these around every test given a driver.
+    """
+    def __init__(self, large_kb=512, chatty=50):
+        self.large = large_kb * 1024
+        self.chatty = chatty
+        # test name -> [entry]
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def before(self, driver, name):
+        """Forget what driver's page has loaded so far."""
+        driver.execute_script(BEGIN_SCRIPT, BUFFER_SIZE)
+
+    def after(self, driver, name):
+        """Record what driver's page has loaded since before (or the last
+        after) against name.
+        """
+        entries = driver.execute_script(TAKE_SCRIPT) or []
+        with self._lock:
+            self.entries.setdefault(name, []).extend(entries)
+
+    def summary(self):
+        """Per test: how many requests it made, the bytes they brought back,
+        how long they took and a breakdown by endpoint, heaviest test first.
+        """
+        with self._lock:
+            entries = dict(
+                (name, list(items)) for name, items in self.entries.items()
+            )
+        tests = []
+        for name, items in entries.items():
+            endpoints = OrderedDict()
+            for entry in items:
+                stats = endpoints.setdefault(endpoint(entry["url"]), {
+                    "requests": 0,
+                    "bytes": 0,
+                    "largest": 0,
+                    "slowest_ms": 0.0,
+                })
+                stats["requests"] += 1
+                stats["bytes"] += entry["transfer"] or entry["body"]
+                stats["largest"] = max(stats["largest"], entry["decoded"])
+                stats["slowest_ms"] = max(stats["slowest_ms"],
+                                          round(entry["duration"], 1))
+            waits = [e["wait"] for e in items if e["wait"] is not None]
+            tests.append(OrderedDict([
+                ("name", name),
+                ("requests", len(items)),
+                ("bytes", sum(s["bytes"] for s in endpoints.values())),
+                ("largest", max([s["largest"] for s in endpoints.values()]
+                                or [0])),
+                ("total_ms", round(sum(e["duration"] for e in items), 1)),
+                ("slowest_ms", max([s["slowest_ms"]
+                                    for s in endpoints.values()] or [0.0])),
+                ("mean_wait_ms", round(sum(waits) / len(waits), 1)
+                 if waits else None),
+                ("endpoints", OrderedDict(sorted(
+                    endpoints.items(), key=lambda item: item[1]["bytes"],
+                    reverse=True
+                ))),
+            ]))
+        tests.sort(key=lambda test: test["bytes"], reverse=True)
+        return tests
+
+    def log_summary(self, summary=None):
+        summary = self.summary() if summary is None else summary
+        for test in summary:
+            log.info("Network {}: {} requests, {:.1f} KB, slowest {} ms, "
+                     "heaviest endpoint {}".format(
+                         test["name"], test["requests"],
+                         test["bytes"] / 1024.0, test["slowest_ms"],
+                         next(iter(test["endpoints"]), None)))
+            if test["largest"] > self.large:
+                log.warning("Network {}: a response of {:.1f} KB".format(
+                    test["name"], test["largest"] / 1024.0
+                ))
+            if test["requests"] > self.chatty:
+                log.warning("Network {}: {} requests".format(
+                    test["name"], test["requests"]
+                ))
+        return summary
@@ -0,0 +1,141 @@
+"""How the runner reacts when a test fails.
+
+Configured by the optional "policy" section of config.json::
+
+    "policy": {
+        "retries": 2,
+        "backoff": 1.0,
+        "max_backoff": 10,
+        "budget": 300,
+        "on_failure": "continue"
+    }
+
+A test failing with a transient error (a timeout, a stale or obscured
+element, a dropped connection) is retried up to ``retries`` times in a
+fresh browser session, waiting ``backoff`` seconds before the first retry
+and twice as long before each one after that, up to ``max_backoff``.
+Assertions about the output are never retried, and neither are tests
+which create or destroy resources unless they ask for it, since a retry
+may trip over what the first attempt left behind.
+
+``budget`` is the most seconds a test may take over all its attempts,
+every wait in the test is cut short once it runs out. With ``on_failure``
+"abort" the first failure stops any further tests from starting, apart
+from those which clean up resources.
+
+A test can change any of these for itself, for instance
+``@test(policy={"retries": 0})``.
+"""
+import random
+import threading
+from contextlib import contextmanager
+from time import time
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+CONTINUE = "continue"
+ABORT = "abort"
+
+# Errors worth another attempt, anything else is taken to be a real failure
+TRANSIENT = (
+    TimeoutException,
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    ConnectionError,
+)
+
+_local = threading.local()
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class Policy(object):
+    def __init__(self, retries=0, backoff=1.0, max_backoff=30.0, budget=None,
+                 on_failure=CONTINUE):
+        if on_failure not in (CONTINUE, ABORT):
+            raise ValueError("on_failure must be {!r} or {!r}, not {!r}".format(
+                CONTINUE, ABORT, on_failure
+            ))
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.on_failure = on_failure
+
+    def settings(self):
+        return dict(retries=self.retries, backoff=self.backoff,
+                    max_backoff=self.max_backoff, budget=self.budget,
+                    on_failure=self.on_failure)
+
+    def for_test(self, test):
+        """This policy with test's own overrides applied."""
+        settings = self.settings()
+        if test.creates or test.destroys:
+            settings["retries"] = 0
+        settings.update(test.policy)
+        return Policy(**settings)
+
+    def delay(self, attempt):
+        """Seconds to wait before retry number attempt (counting from 0),
+        jittered so tests failing together don't retry together.
+        """
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def retry_delay(self, error, attempt):
+        """Seconds to wait before retrying after error on attempt, or None
+        if the test should not be retried.
+        """
+        if attempt >= self.retries or not isinstance(error, TRANSIENT):
+            return None
+        delay = self.delay(attempt)
+        left = remaining()
+        if left is not None and left <= delay:
+            return None
+        return delay
+
+    def __repr__(self):
+        return "<Policy {}>".format(", ".join(
+            "{}={!r}".format(k, v) for k, v in sorted(self.settings().items())
+        ))
+
+
+@contextmanager
+def budget(seconds):
+    """Give the code run by this thread inside the block seconds to finish,
+    see ``remaining``.
+    """
+    previous = getattr(_local, "deadline", None)
+    _local.deadline = None if seconds is None else time() + seconds
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def remaining():
+    """Seconds left of this thread's budget, or None if it has none."""
+    deadline = getattr(_local, "deadline", None)
+    if deadline is None:
+        return None
+    return deadline - time()
+
+
+def cap(timeout):
+    """timeout cut down to what is left of this thread's budget. Raises
+    BudgetExceeded if nothing is left.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise BudgetExceeded("Test ran out of time")
+    return min(timeout, left)
@@ -0,0 +1,216 @@
+"""Timed spans for every step of a run and the report built from them.
+
+The runner marks which test each thread is working on, so a span only
+needs the step name (and optionally the appliance it concerns). At the end
+of a run the spans and test results are written as JSON and/or JUnit XML,
+as configured by the "report" section of config.json::
+
+    "report": {
+        "json": "report.json",
+        "junit": "report.xml"
+    }
+"""
+import json
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from time import time
+from xml.etree import ElementTree
+
+log = logging.getLogger(__name__)
+
+# Spans recorded outside of any test, such as starting the browsers
+SETUP = "(setup)"
+
+
+class Span(object):
+    def __init__(self, test, step, duration, appliance=None, error=None):
+        self.test = test
+        self.step = step
+        self.duration = duration
+        self.appliance = appliance
+        self.error = error
+
+    def as_dict(self):
+        data = {
+            "test": self.test,
+            "step": self.step,
+            "duration": round(self.duration, 6),
+        }
+        if self.appliance is not None:
+            data["appliance"] = self.appliance
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class Recorder(object):
+    def __init__(self):
+        self.started = time()
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def current_test(self):
+        return getattr(self._local, "test", None) or SETUP
+
+    @contextmanager
+    def test(self, name):
+        """Attribute spans recorded by this thread to test name."""
+        self._local.test = name
+        try:
+            yield
+        finally:
+            self._local.test = None
+
+    def add(self, step, duration, appliance=None, error=None):
+        span = Span(self.current_test, step, duration, appliance, error)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, step, appliance=None):
+        start = time()
+        try:
+            yield
+        except Exception as e:
+            self.add(step, time() - start, appliance,
+                     "{}: {}".format(type(e).__name__, e))
+            raise
+        self.add(step, time() - start, appliance)
+
+
+recorder = Recorder()
+
+
+def span(step, appliance=None):
+    """Time the body of a with statement as step of the current test."""
+    return recorder.span(step, appliance)
+
+
+def _error_text(error):
+    if error is None:
+        return None
+    return "".join(traceback.format_exception(
+        type(error), error, error.__traceback__
+    ))
+
+
+def build(results, recorder=recorder, slowest=10):
+    """The run report as a dict, results being the runner's name -> Result
+    mapping.
+    """
+    steps = {}
+    appliances = {}
+    with recorder._lock:
+        spans = list(recorder.spans)
+    for span in spans:
+        steps.setdefault(span.test, []).append(span.as_dict())
+        if span.appliance is not None:
+            entry = appliances.setdefault(
+                span.appliance, {"duration": 0.0, "steps": {}}
+            )
+            entry["duration"] += span.duration
+            entry["steps"][span.step] = round(
+                entry["steps"].get(span.step, 0.0) + span.duration, 6
+            )
+    for entry in appliances.values():
+        entry["duration"] = round(entry["duration"], 6)
+
+    tests = []
+    for result in results.values():
+        tests.append({
+            "name": result.name,
+            "status": result.status,
+            "duration": round(result.duration, 6),
+            "attempts": result.attempts,
+            "error": _error_text(result.error),
+            "steps": steps.get(result.name, []),
+        })
+    return {
+        "started": recorder.started,
+        "duration": round(time() - recorder.started, 6),
+        "setup": steps.get(SETUP, []),
+        "tests": tests,
+        "appliances": appliances,
+        "slowest_steps": [
+            span.as_dict() for span in
+            sorted(spans, key=lambda s: s.duration, reverse=True)[:slowest]
+        ],
+    }
+
+
+def write_json(path, report):
+    with open(path, "w") as fp:
+        json.dump(report, fp, indent=4)
+    log.info("Wrote JSON report to {}".format(path))
+
+
+def write_junit(path, report, name="mast-tests"):
+    tests = report["tests"]
+    suite = ElementTree.Element("testsuite", {
+        "name": name,
+        "tests": str(len(tests)),
+        "failures": str(sum(1 for t in tests if t["status"] == "failed")),
+        "skipped": str(sum(1 for t in tests if t["status"] == "skipped")),
+        "time": "{:.3f}".format(report["duration"]),
+    })
+    for test in tests:
+        case = ElementTree.SubElement(suite, "testcase", {
+            "classname": name if "shard" not in test
+            else "{}.shard{}".format(name, test["shard"]),
+            "name": test["name"],
+            "time": "{:.3f}".format(test["duration"]),
+        })
+        if test["status"] == "failed":
+            lines = (test["error"] or "").strip().splitlines()
+            failure = ElementTree.SubElement(case, "failure", {
+                "message": lines[-1] if lines else "",
+            })
+            failure.text = test["error"]
+        elif test["status"] == "skipped":
+            ElementTree.SubElement(case, "skipped")
+        out = ElementTree.SubElement(case, "system-out")
+        out.text = "\n".join(
+            "{:.3f}s {}{}".format(
+                step["duration"],
+                step["step"],
+                " [{}]".format(step["appliance"]) if "appliance" in step
+                else "",
+            ) for step in test["steps"]
+        )
+    ElementTree.ElementTree(suite).write(
+        path, encoding="utf-8", xml_declaration=True
+    )
+    log.info("Wrote JUnit report to {}".format(path))
+
+
+def write(config, results, extra=None):
+    """Write whichever reports config asks for, extra holds any further
+    sections to add to the JSON report.
+    """
+    if not config:
+        return
+    report = build(results)
+    report.update(extra or {})
+    save(config, report)
+
+
+def save(config, report):
+    """Write report, as built by ``build``, wherever config asks for."""
+    if not config:
+        return
+    if config.get("json"):
+        write_json(config["json"], report)
+    if config.get("junit"):
+        write_junit(config["junit"], report)
+    for span in report["slowest_steps"]:
+        log.info("Slow step: {:.3f}s {} {}{}".format(
+            span["duration"],
+            span["test"],
+            span["step"],
+            " [{}]".format(span["appliance"]) if "appliance" in span else "",
+        ))
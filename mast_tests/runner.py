@@ -0,0 +1,345 @@
+"""Run registered tests concurrently across a pool of WebDriver sessions.
+
+Tests register themselves with the ``test`` decorator, declaring the
+resources they create, read and destroy. The order between tests comes from
+those declarations (see ``mast_tests.graph``), everything else is free to
+run as soon as a session is idle.
+
+A test's parameters name the fixtures it needs (see
+``mast_tests.fixtures``), ``driver`` being a session from the pool.
+Retries, time budgets and whether a failure stops the run come from a
+``mast_tests.policy.Policy``.
+"""
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+from queue import Queue, Empty
+from time import time, sleep
+
+from mast_tests.graph import Graph
+from mast_tests.policy import Policy, ABORT, budget
+from mast_tests.report import recorder
+
+log = logging.getLogger(__name__)
+
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class Test(object):
+    def __init__(self, func, creates=(), reads=(), destroys=(), policy=None,
+                 tab=None):
+        self.func = func
+        self.name = func.__name__
+        self.params = list(inspect.signature(func).parameters)
+        self.creates = list(creates)
+        self.reads = list(reads)
+        self.destroys = list(destroys)
+        # Overrides of the run's policy settings for this test
+        self.policy = dict(policy or {})
+        # The MAST web tab the test works in, if any
+        self.tab = tab
+
+    def __repr__(self):
+        return "<Test {}>".format(self.name)
+
+
+class Result(object):
+    def __init__(self, name, status, duration=0.0, error=None, attempts=1):
+        self.name = name
+        self.status = status
+        self.duration = duration
+        self.error = error
+        self.attempts = attempts
+
+    def __repr__(self):
+        return "<Result {} {}>".format(self.name, self.status)
+
+
+# Tests in the order they were declared
+registry = []
+
+
+def test(creates=(), reads=(), destroys=(), policy=None, tab=None):
+    """Register the decorated function as a test which touches the given
+    resources on the appliances. policy overrides settings of the run's
+    policy for this test only, tab names the MAST web tab it works in.
+    """
+    def decorator(func):
+        registry.append(Test(func, creates, reads, destroys, policy, tab))
+        return func
+    return decorator
+
+
+class SessionPool(object):
+    """Up to size WebDriver sessions, each one created and prepared by
+    factory.
+
+    Sessions are only started when one is asked for and none is idle, so
+    a run which needs fewer browsers starts fewer, and tests which become
+    ready together start theirs concurrently. close is called with each
+    driver when the pool is closed, by default it just quits the browser.
+    """
+    def __init__(self, factory, size, close=None):
+        self.factory = factory
+        self.size = size
+        self._close = close or (lambda driver: driver.quit())
+        self.drivers = []
+        # Seconds each session took to start
+        self.startup = []
+        self._idle = Queue()
+        self._lock = threading.Lock()
+        self._starting = 0
+        self._error = None
+
+    def acquire(self):
+        """An idle session, starting one if none is idle and the pool has
+        room, otherwise waiting for one to be released.
+        """
+        while True:
+            try:
+                driver = self._idle.get(block=False)
+            except Empty:
+                driver = self._start_or_wait()
+            # None is put on the queue when a session is discarded, there
+            # may be room to start another now
+            if driver is not None:
+                return driver
+
+    def _start_or_wait(self):
+        with self._lock:
+            if self._error is not None and not self.drivers:
+                # No session has ever started, don't try again for every test
+                raise self._error
+            start_new = len(self.drivers) + self._starting < self.size
+            if start_new:
+                self._starting += 1
+        if not start_new:
+            return self._idle.get()
+        start = time()
+        try:
+            driver = self.factory()
+        except Exception as e:
+            with self._lock:
+                self._error = e
+            raise
+        finally:
+            with self._lock:
+                self._starting -= 1
+        with self._lock:
+            self.drivers.append(driver)
+            self.startup.append(time() - start)
+        log.info("Started browser session {} of at most {} in {:.3f}s".format(
+            len(self.drivers), self.size, time() - start
+        ))
+        return driver
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    def discard(self, driver):
+        """Close driver instead of releasing it, its page is in an unknown
+        state. The next acquire starts a replacement if none is idle.
+        """
+        with self._lock:
+            self.drivers.remove(driver)
+        try:
+            self._close(driver)
+        except Exception:
+            log.exception("Unable to close browser session")
+        self._idle.put(None)
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        for driver in self.drivers:
+            try:
+                self._close(driver)
+            except Exception:
+                log.exception("Unable to close browser session")
+        self.drivers = []
+
+
+def _notify(watchers, method, driver, test):
+    for watcher in watchers:
+        try:
+            getattr(watcher, method)(driver, test.name)
+        except Exception:
+            log.exception("{}.{} failed for test {}".format(
+                type(watcher).__name__, method, test.name
+            ))
+
+
+def _call(test, pool, resolve, watchers=()):
+    """Run test once, in a session from pool if it takes a driver."""
+    if "driver" not in test.params:
+        test.func(**dict((name, resolve(name)) for name in test.params))
+        return
+    try:
+        driver = pool.acquire()
+    except Exception:
+        log.error("Unable to start a browser session for test {}".format(
+            test.name
+        ))
+        raise
+    _notify(watchers, "before", driver, test)
+    try:
+        test.func(**dict(
+            (name, driver if name == "driver" else resolve(name))
+            for name in test.params
+        ))
+    except Exception:
+        _notify(watchers, "after", driver, test)
+        # Whatever the test left open would trip up the next one
+        pool.discard(driver)
+        raise
+    _notify(watchers, "after", driver, test)
+    pool.release(driver)
+
+
+def _execute(test, pool, resolve, policy, aborted, watchers):
+    if aborted.is_set() and not test.destroys:
+        # Queued before the run was aborted
+        log.warning("Skipping test {}, the run was aborted".format(test.name))
+        return Result(test.name, SKIPPED)
+    policy = policy.for_test(test)
+    with recorder.test(test.name), budget(policy.budget):
+        log.info("Starting test {}".format(test.name))
+        start = time()
+        attempt = 0
+        while True:
+            try:
+                _call(test, pool, resolve, watchers)
+            except Exception as e:
+                duration = time() - start
+                delay = policy.retry_delay(e, attempt)
+                if delay is None:
+                    log.exception("Test {} failed after {:.3f}s".format(
+                        test.name, duration
+                    ))
+                    if policy.on_failure == ABORT and not aborted.is_set():
+                        log.error("Aborting the run, test {} failed".format(
+                            test.name
+                        ))
+                        aborted.set()
+                    return Result(test.name, FAILED, duration, e, attempt + 1)
+                attempt += 1
+                log.warning("Test {} failed with {}: {}, retrying in {:.1f}s "
+                            "({} of {})".format(test.name, type(e).__name__,
+                                                e, delay, attempt,
+                                                policy.retries))
+                with recorder.span("retry backoff"):
+                    sleep(delay)
+                continue
+            duration = time() - start
+            log.info("Test {} passed in {:.3f}s".format(test.name, duration))
+            return Result(test.name, PASSED, duration, attempts=attempt + 1)
+
+
+def leftovers(graph, results):
+    """Resources created by tests which ran (passing or not) and not
+    destroyed by a test which passed, most recently created first.
+    """
+    destroyed = set()
+    for name, result in results.items():
+        if name in graph.tests and result.status == PASSED:
+            destroyed.update(graph.tests[name].destroys)
+    left = []
+    for name in graph.order:
+        if name not in results or results[name].status == SKIPPED:
+            continue
+        for resource in graph.tests[name].creates:
+            if resource not in destroyed and resource not in left:
+                left.append(resource)
+    return left[::-1]
+
+
+def run(tests, pool, resolve, policy=None, cleanup=None, watchers=()):
+    """Run tests on pool and return an OrderedDict of name -> Result in the
+    order the tests finished. resolve is called with the name of every
+    other fixture a test asks for and returns its value.
+
+    A test starts once every test it waits on in the dependency graph has
+    finished, it is skipped if a test it requires did not pass. When more
+    tests are ready than there are idle sessions, declaration order decides.
+    Once a test whose policy is to abort fails, only tests which destroy
+    resources are started.
+
+    At the end cleanup, if given, is called with the ``leftovers`` and
+    returns a list of Results which are added to the results.
+
+    Each of watchers has its ``before(driver, name)`` called just before
+    a test is given a driver and ``after(driver, name)`` once the test is
+    done with it, whether it passed or not.
+    """
+    if policy is None:
+        policy = Policy()
+    graph = Graph(tests)
+    results = OrderedDict()
+    pending = list(graph.order)
+    running = set()
+    finished = Queue()
+    workers = ThreadPool(pool.size)
+    aborted = threading.Event()
+    start = time()
+    try:
+        while pending or running:
+            for name in list(pending):
+                if not graph.after[name] <= set(results):
+                    continue
+                pending.remove(name)
+                if any(results[n].status != PASSED
+                       for n in graph.requires[name]):
+                    log.warning("Skipping test {}, a test it depends "
+                                "on did not pass".format(name))
+                    results[name] = Result(name, SKIPPED)
+                    continue
+                if aborted.is_set() and not graph.tests[name].destroys:
+                    log.warning("Skipping test {}, the run was "
+                                "aborted".format(name))
+                    results[name] = Result(name, SKIPPED)
+                    continue
+                running.add(name)
+                workers.apply_async(
+                    _execute,
+                    (graph.tests[name], pool, resolve, policy, aborted,
+                     watchers),
+                    callback=finished.put,
+                    error_callback=lambda e, name=name: finished.put(
+                        Result(name, FAILED, error=e)
+                    ),
+                )
+            if not running:
+                break
+            result = finished.get()
+            running.discard(result.name)
+            results[result.name] = result
+    finally:
+        workers.close()
+        workers.join()
+
+    if cleanup is not None:
+        left = leftovers(graph, results)
+        if left:
+            for result in cleanup(left):
+                results[result.name] = result
+
+    counts = OrderedDict((s, 0) for s in (PASSED, FAILED, SKIPPED))
+    for result in results.values():
+        counts[result.status] += 1
+    log.info("Ran {} tests in {:.3f}s: {}".format(
+        len(results),
+        time() - start,
+        ", ".join("{} {}".format(n, s) for s, n in counts.items())
+    ))
+    return results
@@ -0,0 +1,121 @@
+"""Run the suite against growing numbers of synthetic appliances.
+
+For every count in the "scale" section of config.json a fresh stand-in
+MAST web (see ``mast_tests.fakeweb``) is started and the whole suite is run
+against that many made up appliances, recording how long setup (starting
+the browsers and registering the appliances) and each test took and the
+browsers' peak memory::
+
+    "scale": {
+        "appliances": [2, 8, 32, 64],
+        "latency": 0.05,
+        "output": "scale.json"
+    }
+
+At the end the slowest growing tests are logged along with how their
+duration scaled with the number of appliances, an exponent of 1 meaning
+they took twice as long with twice as many appliances.
+"""
+import json
+import math
+import logging
+from collections import OrderedDict
+from time import time
+
+from mast_tests.fakeweb import FakeMAST
+from mast_tests.runner import PASSED
+
+log = logging.getLogger(__name__)
+
+
+def synthetic_appliances(count):
+    return [
+        {
+            "hostname": "appliance-{:03d}".format(i),
+            "username": "admin",
+            "password": "admin",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def exponent(first, last):
+    """How (count, seconds) grew from first to last, as the power of the
+    appliance count which duration grew by.
+    """
+    (n1, t1), (n2, t2) = first, last
+    if n1 == n2 or not t1 or not t2:
+        return None
+    return math.log(t2 / t1) / math.log(float(n2) / n1)
+
+
+def run_scale(counts, run_suite, latency=0.0, host="127.0.0.1"):
+    """Call run_suite(address, appliances) for each count in counts against
+    a fresh stand-in MAST web with that many appliances.
+
+    run_suite returns (setup seconds, results, peak memory bytes or None).
+    Returns a list with one dict of measurements per count.
+    """
+    steps = []
+    for count in sorted(counts):
+        fake = FakeMAST(host=host, port=0, latency=latency).start()
+        log.info("Scale test with {} appliances".format(count))
+        start = time()
+        try:
+            setup, results, memory = run_suite(
+                fake.address, synthetic_appliances(count)
+            )
+        finally:
+            fake.stop()
+        step = OrderedDict([
+            ("appliances", count),
+            ("duration", round(time() - start, 3)),
+            ("setup", round(setup, 3)),
+            ("peak_memory_mb", None if memory is None
+             else round(memory / 1024.0 / 1024.0, 1)),
+            ("tests", OrderedDict(
+                (result.name, OrderedDict([
+                    ("status", result.status),
+                    ("duration", round(result.duration, 3)),
+                ])) for result in results.values()
+            )),
+        ])
+        log.info("{} appliances: setup {}s, peak memory {} MB, {} tests in "
+                 "{}s".format(count, step["setup"], step["peak_memory_mb"],
+                              len(results), step["duration"]))
+        steps.append(step)
+    return steps
+
+
+def scaling(steps):
+    """name -> exponent for setup and every test which passed at both the
+    smallest and largest count, steepest first.
+    """
+    if len(steps) < 2:
+        return OrderedDict()
+    first, last = steps[0], steps[-1]
+    rows = [("setup", exponent((first["appliances"], first["setup"]),
+                               (last["appliances"], last["setup"])))]
+    for name, test in last["tests"].items():
+        before = first["tests"].get(name)
+        if (not before or before["status"] != PASSED
+                or test["status"] != PASSED):
+            continue
+        rows.append((name, exponent(
+            (first["appliances"], before["duration"]),
+            (last["appliances"], test["duration"]),
+        )))
+    rows = [(name, round(e, 2)) for name, e in rows if e is not None]
+    return OrderedDict(sorted(rows, key=lambda row: row[1], reverse=True))
+
+
+def save(steps, path):
+    data = OrderedDict([("steps", steps), ("scaling", scaling(steps))])
+    with open(path, "w") as fp:
+        json.dump(data, fp, indent=4)
+    log.info("Wrote scale test results to {}".format(path))
+
+
+def log_scaling(steps):
+    for name, value in scaling(steps).items():
+        log.info("Scaling {}: duration ~ appliances^{}".format(name, value))
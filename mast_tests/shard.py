@@ -0,0 +1,312 @@
+"""Split a run across several worker processes, each with browsers of its
+own, and merge what they report.
+
+Configured by the optional "shards" section of config.json::
+
+    "shards": {
+        "workers": 4,
+        "grid": "http://grid.example.com:4444/wd/hub",
+        "local_grid": false,
+        "port": 4444
+    }
+
+The tests are split into groups which share no resources, so a group can
+run on its own, and the appliances into chunks. Each worker runs one group
+of tests against one chunk of appliances, which keeps every test checking
+every appliance once. With ``grid`` the workers' browsers are started by
+that Selenium Grid, with ``local_grid`` by nodes started on this machine
+from ``port`` up (see ``mast_tests.grid``), otherwise on this machine
+directly.
+
+Each worker runs ``python -m mast_tests`` with a config.json of its own
+under ``<cache>/shards/<worker>``, where it also writes its report and log.
+Once every worker is done these are merged into the run's report and into
+one log (the configured log file with ``.shards`` before its extension).
+"""
+import os
+import sys
+import copy
+import json
+import logging
+import subprocess
+from collections import OrderedDict
+from itertools import product
+
+from mast_tests.graph import Graph
+from mast_tests.naming import WORKER_VARIABLE
+from mast_tests.runner import Result, PASSED, FAILED, SKIPPED
+
+log = logging.getLogger(__name__)
+
+
+class Shard(object):
+    def __init__(self, index, tests, appliances):
+        self.index = index
+        # Names of the tests this worker runs, in declaration order
+        self.tests = tests
+        self.appliances = appliances
+        self.directory = None
+        self.process = None
+        self.returncode = None
+
+    @property
+    def hostnames(self):
+        return [appliance["hostname"] for appliance in self.appliances]
+
+    def __repr__(self):
+        return "<Shard {} {} tests on {}>".format(
+            self.index, len(self.tests), ", ".join(self.hostnames)
+        )
+
+
+def groups(tests):
+    """tests split into groups which don't wait on each other, each in
+    declaration order.
+    """
+    graph = Graph(tests)
+    group_of = dict((name, name) for name in graph.tests)
+
+    def root(name):
+        while group_of[name] != name:
+            name = group_of[name]
+        return name
+
+    for name, after in graph.after.items():
+        for other in after:
+            group_of[root(other)] = root(name)
+    members = OrderedDict()
+    for name in graph.tests:
+        members.setdefault(root(name), []).append(name)
+    return list(members.values())
+
+
+def split(groups, count, weight):
+    """groups dealt into at most count bins of about equal total weight,
+    heaviest first. Each bin lists its names in declaration order.
+    """
+    bins = [[] for _ in range(count)]
+    totals = [0.0] * count
+    for group in sorted(groups, key=weight, reverse=True):
+        lightest = totals.index(min(totals))
+        bins[lightest].extend(group)
+        totals[lightest] += weight(group)
+    order = dict((name, i) for i, name in enumerate(
+        name for group in groups for name in group
+    ))
+    return [sorted(b, key=order.get) for b in bins if b]
+
+
+def plan(tests, appliances, workers, durations=None):
+    """Shards for running tests against appliances with up to workers
+    workers. durations, seconds each test took before, balances the test
+    groups between workers.
+    """
+    durations = durations or {}
+    chunks = max(min(workers, len(appliances)), 1)
+    test_bins = max(workers // chunks, 1)
+    test_groups = split(
+        groups(tests), test_bins,
+        lambda group: sum(durations.get(name) or 1.0 for name in group),
+    )
+    appliance_chunks = [appliances[i::chunks] for i in range(chunks)]
+    shards = [
+        Shard(i, names, chunk) for i, (names, chunk) in
+        enumerate(product(test_groups, appliance_chunks))
+    ]
+    if len(shards) < workers:
+        log.info("Using {} of {} workers, {} test groups by {} appliance "
+                 "chunks".format(len(shards), workers, len(test_groups),
+                                 chunks))
+    return shards
+
+
+def worker_config(config, shard, remote=None, namespace=None):
+    """config for the worker running shard."""
+    config = copy.deepcopy(config)
+    config["appliances"] = shard.appliances
+    config["report"] = {"json": os.path.join(shard.directory, "report.json")}
+    config["logging"].update(
+        stdout=False,
+        filename=os.path.join(shard.directory, "ui-tests.log"),
+        mode="w",
+    )
+    # The monitor needs a browser of its own which no worker can spare
+    config.pop("monitor", None)
+    config.pop("shards", None)
+    if remote:
+        config["browser"] = dict(config.get("browser", {}), remote=remote)
+    if namespace is not None:
+        config["namespace"] = namespace
+    return config
+
+
+def run_shards(shards, config, cache, remotes, namespace=None, args=()):
+    """Run each shard in a worker process of its own and wait for them
+    all. remotes has the remote URL(s) for each shard's browsers, args are
+    passed on to every worker.
+    """
+    for shard, remote in zip(shards, remotes):
+        shard.directory = os.path.join(cache, "shards", str(shard.index))
+        if not os.path.isdir(shard.directory):
+            os.makedirs(shard.directory)
+        path = os.path.join(shard.directory, "config.json")
+        with open(path, "w") as fp:
+            json.dump(worker_config(config, shard, remote, namespace), fp,
+                      indent=4)
+        env = dict(os.environ)
+        env[WORKER_VARIABLE] = str(shard.index)
+        shard.process = subprocess.Popen(
+            [sys.executable, "-m", "mast_tests", "-c", path] + list(args) +
+            shard.tests,
+            env=env,
+        )
+        log.info("Started shard {}: {} against {}".format(
+            shard.index, ", ".join(shard.tests), ", ".join(shard.hostnames)
+        ))
+    for shard in shards:
+        shard.returncode = shard.process.wait()
+        log.info("Shard {} finished with exit code {}".format(
+            shard.index, shard.returncode
+        ))
+
+
+def _load_report(shard):
+    path = os.path.join(shard.directory, "report.json")
+    try:
+        with open(path) as fp:
+            return json.load(fp)
+    except (IOError, OSError, ValueError):
+        log.error("Shard {} left no readable report at {}".format(
+            shard.index, path
+        ))
+        return None
+
+
+def merge_reports(shards, slowest=10):
+    """One report for the run from every shard's, with the test entries
+    and steps tagged with the shard they came from. A shard which left no
+    report has its tests marked as failed.
+    """
+    started = []
+    ended = []
+    tests = []
+    setup = []
+    appliances = {}
+    slowest_steps = []
+    summaries = []
+    for shard in shards:
+        report = _load_report(shard)
+        summary = OrderedDict([
+            ("index", shard.index),
+            ("tests", shard.tests),
+            ("appliances", shard.hostnames),
+            ("exit_code", shard.returncode),
+        ])
+        summaries.append(summary)
+        if report is None:
+            tests.extend({
+                "name": name,
+                "status": FAILED,
+                "duration": 0.0,
+                "attempts": 0,
+                "error": "Shard {} exited with code {} and left no "
+                         "report".format(shard.index, shard.returncode),
+                "steps": [],
+                "shard": shard.index,
+            } for name in shard.tests)
+            continue
+        started.append(report["started"])
+        ended.append(report["started"] + report["duration"])
+        tests.extend(dict(test, shard=shard.index)
+                     for test in report["tests"])
+        setup.extend(dict(step, shard=shard.index)
+                     for step in report["setup"])
+        for hostname, entry in report["appliances"].items():
+            merged = appliances.setdefault(
+                hostname, {"duration": 0.0, "steps": {}}
+            )
+            merged["duration"] = round(
+                merged["duration"] + entry["duration"], 6
+            )
+            for step, duration in entry["steps"].items():
+                merged["steps"][step] = round(
+                    merged["steps"].get(step, 0.0) + duration, 6
+                )
+        slowest_steps.extend(dict(span, shard=shard.index)
+                             for span in report["slowest_steps"])
+        # Sections such as the network summary stay with their shard
+        for key, value in report.items():
+            if key not in ("started", "duration", "setup", "tests",
+                           "appliances", "slowest_steps"):
+                summary[key] = value
+    return {
+        "started": min(started) if started else None,
+        "duration": round(max(ended) - min(started), 6) if started else 0.0,
+        "setup": setup,
+        "tests": tests,
+        "appliances": appliances,
+        "slowest_steps": sorted(slowest_steps, key=lambda s: s["duration"],
+                                reverse=True)[:slowest],
+        "shards": summaries,
+    }
+
+
+def results(report):
+    """name -> Result for each test in a merged report. A test which ran in
+    several shards failed if it failed in any of them.
+    """
+    results = OrderedDict()
+    for test in report["tests"]:
+        previous = results.get(test["name"])
+        status = test["status"]
+        if previous is not None:
+            statuses = (previous.status, status)
+            status = FAILED if FAILED in statuses else \
+                SKIPPED if SKIPPED in statuses else PASSED
+        results[test["name"]] = Result(
+            test["name"], status,
+            max(test["duration"], previous.duration if previous else 0.0),
+            test["error"] or (previous.error if previous else None),
+            max(test["attempts"], previous.attempts if previous else 0),
+        )
+    return results
+
+
+def merged_log_path(filename):
+    root, extension = os.path.splitext(filename)
+    return "{}.shards{}".format(root, extension)
+
+
+def merge_logs(shards, config):
+    """Write every shard's log into one file next to the configured one.
+    JSON lines are interleaved by time and tagged with their shard, text
+    lines are written a shard at a time behind a 'shard'='N' field.
+    Returns the merged log's path, None if no log file is configured.
+    """
+    if "filename" not in config:
+        return None
+    path = merged_log_path(config["filename"])
+    json_lines = config.get("format", "text") == "json"
+    records = []
+    with open(path, "w") as out:
+        for shard in shards:
+            try:
+                with open(os.path.join(shard.directory, "ui-tests.log")) as fp:
+                    lines = fp.read().splitlines()
+            except (IOError, OSError):
+                log.error("Shard {} left no log".format(shard.index))
+                continue
+            for line in lines:
+                if json_lines:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    record["shard"] = shard.index
+                    records.append(record)
+                else:
+                    out.write("'shard'='{}'; {}\n".format(shard.index, line))
+        for record in sorted(records, key=lambda r: r["time"]):
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+    log.info("Merged the shards' logs into {}".format(path))
+    return path
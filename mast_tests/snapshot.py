@@ -0,0 +1,115 @@
+"""Save a prepared MAST web session to disk and restore it later.
+
+A snapshot holds the session's cookies, local and session storage and the
+appliances which were registered. It is stored under a key derived from
+the address and appliances in config.json, so changing either one means
+the old snapshot is no longer used.
+"""
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from time import time
+
+from selenium.common.exceptions import WebDriverException
+
+log = logging.getLogger(__name__)
+
+READ_STORAGE_SCRIPT = """
+var result = {};
+var storage = window[arguments[0]];
+for (var i = 0; i < storage.length; i++) {
+    var key = storage.key(i);
+    result[key] = storage.getItem(key);
+}
+return result;
+"""
+
+WRITE_STORAGE_SCRIPT = """
+var storage = window[arguments[0]];
+var items = arguments[1];
+storage.clear();
+for (var key in items) {
+    storage.setItem(key, items[key]);
+}
+"""
+
+
+def cache_key(address, appliances):
+    data = json.dumps(
+        {"address": address, "appliances": appliances}, sort_keys=True
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+class Snapshot(object):
+    def __init__(self, directory, address, appliances):
+        self.address = address
+        self.appliances = appliances
+        self.path = os.path.join(
+            directory, "sessions", cache_key(address, appliances) + ".json"
+        )
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def save(self, driver):
+        data = {
+            "address": self.address,
+            "created": time(),
+            "cookies": driver.get_cookies(),
+            "localStorage": driver.execute_script(
+                READ_STORAGE_SCRIPT, "localStorage"
+            ),
+            "sessionStorage": driver.execute_script(
+                READ_STORAGE_SCRIPT, "sessionStorage"
+            ),
+            "appliances": [
+                appliance["hostname"] for appliance in self.appliances
+                if driver.find_elements_by_id(appliance["hostname"])
+            ],
+        }
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        # Several sessions may save at once, and the snapshot can hold
+        # credentials, so write privately and move it into place
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as fp:
+            json.dump(data, fp)
+        os.replace(tmp, self.path)
+        log.info("Saved session snapshot {}".format(self.path))
+
+    def restore(self, driver):
+        """Load the snapshot into driver, which must already be showing
+        MAST web, and return the appliances which are still missing.
+        """
+        if not self.exists():
+            return list(self.appliances)
+        try:
+            with open(self.path) as fp:
+                data = json.load(fp)
+            for cookie in data["cookies"]:
+                driver.add_cookie(cookie)
+            driver.execute_script(
+                WRITE_STORAGE_SCRIPT, "localStorage", data["localStorage"]
+            )
+            driver.execute_script(
+                WRITE_STORAGE_SCRIPT, "sessionStorage", data["sessionStorage"]
+            )
+            driver.refresh()
+        except (ValueError, KeyError, WebDriverException):
+            log.exception("Unable to restore session snapshot {}".format(
+                self.path
+            ))
+            return list(self.appliances)
+        missing = [
+            appliance for appliance in self.appliances
+            if not driver.find_elements_by_id(appliance["hostname"])
+        ]
+        log.info("Restored session snapshot {}, {} of {} appliances "
+                 "registered".format(self.path,
+                                     len(self.appliances) - len(missing),
+                                     len(self.appliances)))
+        return missing
@@ -0,0 +1,160 @@
+"""Drive the ssh tab, one session on every appliance at once.
+
+The first command is sent on its own and every appliance has to answer it,
+so each has a session, before anything else is sent. After that each
+command is sent once every appliance has answered the one before, or, with
+``depth`` above 1, up to depth commands ahead of the slowest appliance
+without waiting. Each appliance's textarea is followed as a transcript of
+its own: every command's echo has to show up in it in the order the
+commands were sent, any error stops the session straight away, and how
+long each command took to come back is recorded against that appliance.
+
+Configured by the optional "ssh" section of config.json::
+
+    "ssh": {
+        "depth": 1
+    }
+
+Only set depth above 1 for a MAST web known to keep ssh commands in order
+and to clear the command box after each one.
+"""
+import re
+import logging
+from collections import OrderedDict
+from time import time
+
+from selenium.common.exceptions import TimeoutException
+
+from mast_tests.extract import read_outputs
+from mast_tests.report import recorder, span
+from mast_tests.stream import ERROR_PATTERNS, OutputError
+from mast_tests.waits import Condition, wait_for
+
+log = logging.getLogger(__name__)
+
+
+class Transcript(object):
+    """One appliance's side of a session.
+
+    offset is how much of the textarea was there before the session
+    started, until are texts which have to follow the last command's echo
+    for the session to be over.
+    """
+    def __init__(self, hostname, name, commands, offset=0, until=(),
+                 errors=None):
+        self.hostname = hostname
+        self.name = name
+        self.commands = list(commands)
+        self.offset = offset
+        self.until = list(until)
+        self.patterns = [re.compile(p) for p in (ERROR_PATTERNS if errors is
+                                                 None else errors)]
+        # Commands whose echo has shown up so far
+        self.answered = 0
+        self.output = ""
+        self._position = offset
+
+    @property
+    def done(self):
+        return self.answered == len(self.commands) and all(
+            text in self.output[self._position - self.offset:]
+            for text in self.until
+        )
+
+    @property
+    def waiting_for(self):
+        if self.answered < len(self.commands):
+            return repr(self.commands[self.answered])
+        return ", ".join(repr(t) for t in self.until)
+
+    def update(self, value, sent):
+        """Follow value, the textarea's current value, given the times the
+        commands so far were sent at. Returns whether anything new showed
+        up, raises OutputError if the appliance reported an error.
+        """
+        value = value or ""
+        progressed = value[self.offset:] != self.output
+        self.output = value[self.offset:]
+        while self.answered < len(sent):
+            command = self.commands[self.answered]
+            index = value.find(command, self._position)
+            if index < 0:
+                break
+            self._position = index + len(command)
+            elapsed = time() - sent[self.answered]
+            log.debug("{} answered {!r} after {:.3f}s".format(
+                self.hostname, command, elapsed
+            ))
+            recorder.add("ssh {!r}".format(command), elapsed, self.hostname)
+            self.answered += 1
+        for pattern in self.patterns:
+            match = pattern.search(self.output)
+            if match:
+                line = self.output[match.start():].splitlines()[0]
+                raise OutputError("Error from {} after {}: {}".format(
+                    self.hostname,
+                    repr(self.commands[max(self.answered - 1, 0)]),
+                    line.strip(),
+                ))
+        return progressed
+
+
+def progressed(transcripts, sent):
+    """Condition satisfied once any of transcripts changes, yielding the
+    ones which did.
+    """
+    def check(driver):
+        values = read_outputs(driver, textareas=[t.name for t in transcripts])
+        changed = [t for t in transcripts
+                   if t.update(values.get(t.name), sent)]
+        return changed or None
+    return Condition(check, "ssh output from {}".format(
+        ", ".join(t.hostname for t in transcripts)
+    ))
+
+
+def run_session(driver, hostnames, commands, until=(), depth=None,
+                timeout=None):
+    """Send commands to every appliance in hostnames through the ssh tab,
+    which must be open, and follow each one's transcript until it has
+    answered all of them and shown the texts in until. depth is how many
+    commands may be waiting for an answer at once, 1 by default.
+
+    Returns an OrderedDict of hostname -> the session's output.
+    """
+    command_box = driver.find_element_by_name("sshCommand")
+    submit = driver.find_element_by_name("sshCommandButton")
+    textareas = OrderedDict(
+        (hostname, "textarea_{}".format(hostname)) for hostname in hostnames
+    )
+    before = read_outputs(driver, textareas=textareas.values())
+    transcripts = [
+        Transcript(hostname, name, commands, len(before.get(name) or ""),
+                   until)
+        for hostname, name in textareas.items()
+    ]
+    depth = depth or 1
+    sent = []
+    while True:
+        answered = min(t.answered for t in transcripts)
+        # Nothing more is sent until every appliance has a session
+        limit = depth if answered else 1
+        while len(sent) < len(commands) and len(sent) - answered < limit:
+            command = commands[len(sent)]
+            log.debug("Sending ssh command '{}'".format(command))
+            with span("submit"):
+                command_box.send_keys(command)
+                submit.click()
+            sent.append(time())
+        if all(t.done for t in transcripts):
+            break
+        try:
+            wait_for(driver, progressed(transcripts, sent), timeout=timeout)
+        except TimeoutException:
+            raise TimeoutException(
+                "Timed out waiting for ssh output, {}".format("; ".join(
+                    "{} waiting for {}".format(t.hostname, t.waiting_for)
+                    for t in transcripts if not t.done
+                ))
+            )
+    return OrderedDict((t.hostname, t.output) for t in transcripts)
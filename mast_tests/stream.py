@@ -0,0 +1,88 @@
+"""Verify output while MAST web is still writing it.
+
+streamed() is a wait condition which reads the watched results panes and
+textareas on every poll, ticks off each expected text as soon as it shows
+up and gives up straight away if any appliance reports an error, rather
+than waiting for the whole output before checking anything.
+"""
+import re
+import logging
+from time import time
+
+from mast_tests.extract import read_outputs
+from mast_tests.report import recorder
+from mast_tests.waits import Condition
+
+log = logging.getLogger(__name__)
+
+# Output matching any of these means the action failed on an appliance
+ERROR_PATTERNS = [
+    r"Traceback \(most recent call last\)",
+    r"(?m)^\s*Error:",
+    r"(?m)^% ",
+    r"(?i)authentication fail",
+]
+
+
+class OutputError(AssertionError):
+    """An appliance reported an error in the output being watched."""
+
+
+def _describe(key):
+    return key[1] if isinstance(key, tuple) else key
+
+
+def streamed(panes=None, textareas=None, offsets=None, appliances=None,
+             errors=None):
+    """Condition satisfied once every expected text is in its output.
+
+    panes maps results pane locators, and textareas maps textarea names, to
+    the texts expected in them. offsets maps a textarea name to how much of
+    its value was there before, only what comes after is watched.
+    appliances maps a textarea name to the hostname it belongs to, so the
+    time each text showed up can be recorded against that appliance.
+
+    Raises OutputError as soon as an output matches one of errors (by
+    default ERROR_PATTERNS). Yields a dict of the (watched part of the)
+    outputs.
+    """
+    panes = panes or {}
+    textareas = textareas or {}
+    offsets = offsets or {}
+    appliances = appliances or {}
+    patterns = [re.compile(p) for p in (ERROR_PATTERNS if errors is None
+                                        else errors)]
+    expected = dict(panes)
+    expected.update(textareas)
+    pending = dict((key, list(texts)) for key, texts in expected.items())
+    start = time()
+
+    def check(driver):
+        outputs = read_outputs(driver, panes, textareas)
+        for key in outputs:
+            output = (outputs[key] or "")[offsets.get(key, 0):]
+            outputs[key] = output
+            for pattern in patterns:
+                match = pattern.search(output)
+                if match:
+                    line = output[match.start():].splitlines()[0]
+                    raise OutputError("Error in {}: {}".format(
+                        _describe(key), line.strip()
+                    ))
+            for text in list(pending[key]):
+                if text in output:
+                    pending[key].remove(text)
+                    elapsed = time() - start
+                    log.debug("Found {!r} in {} after {:.3f}s".format(
+                        text, _describe(key), elapsed
+                    ))
+                    recorder.add("found {!r}".format(text), elapsed,
+                                 appliances.get(key))
+        if any(pending.values()):
+            return None
+        return outputs
+    return Condition(check, "{} in {}".format(
+        ", ".join(sorted(set(t for texts in expected.values()
+                             for t in texts))),
+        ", ".join(_describe(key) for key in expected)
+    ))
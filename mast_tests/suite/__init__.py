@@ -0,0 +1,15 @@
+"""The MAST web UI tests.
+
+Importing this package registers every test with mast_tests.runner. The
+modules are imported in the order the tests were written, which is the
+order they run in wherever the dependency graph leaves a choice.
+"""
+from mast_tests.suite import (  # noqa: F401
+    page,
+    system,
+    accounts,
+    backups,
+    developer,
+    network,
+    ssh,
+)
@@ -0,0 +1,308 @@
+"""Tests for the accounts tab."""
+import logging
+
+from mast_tests import locators
+from mast_tests import waits
+from mast_tests.extract import verify
+from mast_tests.forms import fill
+from mast_tests.locators import find
+from mast_tests.report import span
+from mast_tests.runner import test
+from mast_tests.waits import (
+    wait_for,
+    element_visible,
+    results_closed,
+    results_ready,
+)
+
+log = logging.getLogger(__name__)
+
+ACCOUNTS_RESULTS = locators.results("accounts")
+
+
+##########################
+# Test 10: list groups
+##########################
+@test(tab="accounts")
+def list_groups(driver, hostnames):
+    log.debug("Testing accounts -> list groups")
+    find(driver, locators.tab("accounts")).click()
+    find(driver, locators.action("list groups")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("list_groups")))
+
+    log.debug("Selecting no-check-hostname")
+    fill(driver, form, {"no_check_hostname": True})
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("accountsFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(ACCOUNTS_RESULTS, hostnames, form, "accountsFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["All"]
+    with span("assert"):
+        verify(driver, panes={ACCOUNTS_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(ACCOUNTS_RESULTS))
+
+
+###########################
+# Test 11: add group
+###########################
+@test(tab="accounts", creates=["group:demoRO"])
+def add_group(driver, hostnames, names):
+    log.debug("Testing accounts -> add group")
+    find(driver, locators.tab("accounts")).click()
+    find(driver, locators.action("add group")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("add_group")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "name": names.group,
+        "no_check_hostname": True,
+    })
+
+    log.debug("Adding Access Policy for group '{}'".format(names.group))
+    form.find_element_by_class_name("multiTextTextbox").send_keys("*/*/*?Access=r")
+    form.find_element_by_class_name("multiTextButton").click()
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("accountsFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(ACCOUNTS_RESULTS, hostnames, form, "accountsFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Succeeded"]
+
+    with span("assert"):
+        verify(driver, panes={ACCOUNTS_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(ACCOUNTS_RESULTS))
+
+
+###########################
+# Test 12: add user
+###########################
+@test(tab="accounts", creates=["user:demoTest"],
+      reads=["group:demoRO"])
+def add_user(driver, hostnames, names):
+    log.debug("Testing accounts -> add user")
+    find(driver, locators.tab("accounts")).click()
+    find(driver, locators.action("add user")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("add_user")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "username": names.user,
+        "password": "Pa$$W0rd",
+        "group": names.group,
+        "save_config": True,
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("accountsFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(ACCOUNTS_RESULTS, hostnames, form, "accountsFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Succeeded"]
+
+    with span("assert"):
+        verify(driver, panes={ACCOUNTS_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(ACCOUNTS_RESULTS))
+
+
+####################################################################
+# Test 13: list groups (looking for group which should exist now)
+####################################################################
+@test(tab="accounts", reads=["group:demoRO"])
+def list_groups_demo(driver, hostnames, names):
+    log.debug("Testing accounts -> list groups "
+              "(looking for group which should exist now)")
+    find(driver, locators.tab("accounts")).click()
+    find(driver, locators.action("list groups")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("list_groups")))
+
+    log.debug("Selecting no-check-hostname")
+    fill(driver, form, {"no_check_hostname": True})
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("accountsFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(ACCOUNTS_RESULTS, hostnames, form, "accountsFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["All", names.group]
+    with span("assert"):
+        verify(driver, panes={ACCOUNTS_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(ACCOUNTS_RESULTS))
+
+
+#############################################################
+# Test 14: list users (looking for user which should exist)
+#############################################################
+@test(tab="accounts", reads=["user:demoTest"])
+def list_users(driver, hostnames, names):
+    log.debug("Testing accounts -> list users "
+              "(looking for user which should exist now)")
+    find(driver, locators.tab("accounts")).click()
+    find(driver, locators.action("list users")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("list_users")))
+
+    log.debug("Selecting no-check-hostname")
+    fill(driver, form, {"no_check_hostname": True})
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("accountsFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(ACCOUNTS_RESULTS, hostnames, form, "accountsFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["All", names.user]
+    with span("assert"):
+        verify(driver, panes={ACCOUNTS_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(ACCOUNTS_RESULTS))
+
+
+#######################
+# Test 15: del user
+#######################
+@test(tab="accounts", destroys=["user:demoTest"],
+      reads=["group:demoRO"])
+def del_user(driver, hostnames, names):
+    log.debug("Testing accounts -> del user "
+              "(looking for user which should exist now)")
+    find(driver, locators.tab("accounts")).click()
+    find(driver, locators.action("del user")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("del_user")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "save_config": True,
+        "no_check_hostname": True,
+        "User": names.user,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("accountsFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(ACCOUNTS_RESULTS, hostnames, form, "accountsFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Succeeded"]
+    with span("assert"):
+        verify(driver, panes={ACCOUNTS_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(ACCOUNTS_RESULTS))
+
+
+#######################
+# Test 15: del group
+#######################
+@test(tab="accounts", destroys=["group:demoRO"])
+def del_group(driver, hostnames, names):
+    log.debug("Testing accounts -> del group "
+              "(looking for user which should exist now)")
+    find(driver, locators.tab("accounts")).click()
+    find(driver, locators.action("del group")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("del_group")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "save_config": True,
+        "no_check_hostname": True,
+        "UserGroup": names.group,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("accountsFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(ACCOUNTS_RESULTS, hostnames, form, "accountsFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Succeeded"]
+    with span("assert"):
+        verify(driver, panes={ACCOUNTS_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(ACCOUNTS_RESULTS))
@@ -0,0 +1,98 @@
+"""Tests for the backups tab."""
+import logging
+
+from mast_tests import locators
+from mast_tests.forms import fill
+from mast_tests.locators import find
+from mast_tests.report import span
+from mast_tests.runner import test
+from mast_tests.stream import streamed
+from mast_tests.waits import (
+    wait_for,
+    element_visible,
+    results_closed,
+    results_ready,
+)
+
+log = logging.getLogger(__name__)
+
+BACKUPS_RESULTS = locators.results("backups")
+
+
+###############################
+# Test 16: get normal backup
+###############################
+# Backups and checkpoints are written to temporary:, which clean up empties
+@test(tab="backups", reads=["domain:demo", "files:temporary"])
+def get_normal_backup(driver, hostnames, names):
+    log.debug("Testing backups -> get normal backup`")
+    find(driver, locators.tab("backups")).click()
+    find(driver, locators.action("get normal backup")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("get_normal_backup")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "comment": "test",
+        "Domain": [names.domain],
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("backupsFormSubmit").click()
+
+    log.debug("Form submitted, checking results as they appear")
+    expected_texts = list(hostnames)
+    expected_texts += ["Verified"]
+    wait_for(driver, streamed(panes={BACKUPS_RESULTS: expected_texts}))
+    log.info("All expected text was found in results")
+
+    results = wait_for(
+        driver,
+        results_ready(BACKUPS_RESULTS, hostnames, form, "backupsFormSubmit")
+    )
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(BACKUPS_RESULTS))
+
+
+#############################
+# Test 17: set checkpoint
+#############################
+@test(tab="backups", reads=["domain:demo", "files:temporary"])
+def set_checkpoint(driver, hostnames, names):
+    log.debug("Testing backups -> set checkpoint`")
+    find(driver, locators.tab("backups")).click()
+    find(driver, locators.action("set checkpoint")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("set_checkpoint")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "comment": "test",
+        "Domain": [names.domain],
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("backupsFormSubmit").click()
+
+    log.debug("Form submitted, checking results as they appear")
+    expected_texts = list(hostnames)
+    expected_texts += ["Succeeded"]
+    wait_for(driver, streamed(panes={BACKUPS_RESULTS: expected_texts}))
+    log.info("All expected text was found in results")
+
+    results = wait_for(
+        driver,
+        results_ready(BACKUPS_RESULTS, hostnames, form, "backupsFormSubmit")
+    )
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(BACKUPS_RESULTS))
@@ -0,0 +1,104 @@
+"""Tests for the developer tab."""
+import logging
+
+from mast_tests import locators
+from mast_tests import waits
+from mast_tests.extract import verify
+from mast_tests.forms import fill
+from mast_tests.locators import find
+from mast_tests.report import span
+from mast_tests.runner import test
+from mast_tests.waits import (
+    wait_for,
+    element_visible,
+    results_closed,
+    results_ready,
+)
+
+log = logging.getLogger(__name__)
+
+DEVELOPER_RESULTS = locators.results("developer")
+
+
+#################################
+# Test 18: flush document cache
+#################################
+@test(tab="developer", reads=["domain:demo"])
+def flush_document_cache(driver, hostnames, names):
+    log.debug("Testing developer -> flush document cache`")
+    find(driver, locators.tab("developer")).click()
+    find(driver, locators.action("flush document cache")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("flush_document_cache")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "xml_manager": "default",
+        "Domain": names.domain,
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("developerFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(DEVELOPER_RESULTS, hostnames, form, "developerFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Succeeded"]
+    with span("assert"):
+        verify(driver, panes={DEVELOPER_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(DEVELOPER_RESULTS))
+
+
+#################################
+# Test 19: show probes
+#################################
+@test(tab="developer", reads=["domain:demo"])
+def list_probes(driver, names):
+    log.debug("Testing developer -> list probes`")
+    find(driver, locators.tab("developer")).click()
+    find(driver, locators.action("list probes")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("list_probes")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "Domain": [names.domain],
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("developerFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(DEVELOPER_RESULTS,
+                      [],
+                      form,
+                      "developerFormSubmit",
+                      texts=["Appliance", "Result"])
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = ["Appliance", "Result"]
+    with span("assert"):
+        verify(driver, panes={DEVELOPER_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(DEVELOPER_RESULTS))
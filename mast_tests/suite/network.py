@@ -0,0 +1,116 @@
+"""Tests for the network tab."""
+import logging
+
+from mast_tests import locators
+from mast_tests import waits
+from mast_tests.extract import verify
+from mast_tests.forms import fill
+from mast_tests.locators import find
+from mast_tests.report import span
+from mast_tests.runner import test
+from mast_tests.waits import (
+    wait_for,
+    element_visible,
+    results_closed,
+    results_ready,
+)
+
+log = logging.getLogger(__name__)
+
+NETWORK_RESULTS = locators.results("network")
+
+
+#################################
+# Test 20: display routing table
+#################################
+@test(tab="network")
+def display_routing_table(driver, hostnames):
+    log.debug("Testing network -> display routing table`")
+    find(driver, locators.tab("network")).click()
+    find(driver, locators.action("display routing table")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("display_routing_table")))
+
+    log.debug("Selecting no-check-hostname")
+    fill(driver, form, {"no_check_hostname": True})
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("networkFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(NETWORK_RESULTS, hostnames, form, "networkFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Appliance",
+                       "IPType",
+                       "Destination",
+                       "PrefixLength",
+                       "InterfaceType",
+                       "MacInterface",
+                       "GatewayIPType",
+                       "Gateway",
+                       "Metric"]
+    with span("assert"):
+        verify(driver, panes={NETWORK_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(NETWORK_RESULTS))
+
+
+##################################
+# Test 21: tcp connection test
+##################################
+@test(tab="network")
+def tcp_connection_test(driver, hostnames):
+    log.debug("Testing network -> tcp connection test")
+    find(driver, locators.tab("network")).click()
+    find(driver, locators.action("tcp connection test")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("tcp_connection_test")))
+
+    log.debug("Adding remote hosts")
+    for hostname in hostnames:
+        find(driver, locators.multitext_box("tcp_connection_test"), 0).send_keys(hostname)
+        find(driver, locators.multitext_button("tcp_connection_test"), 0).click()
+
+    log.debug("Adding remote ports")
+    for port in ["22", "5550", "9090"]:
+        find(driver, locators.multitext_box("tcp_connection_test"), 1).send_keys(port)
+        find(driver, locators.multitext_button("tcp_connection_test"), 1).click()
+
+    log.debug("Selecting no-check-hostname")
+    fill(driver, form, {"no_check_hostname": True})
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("networkFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(NETWORK_RESULTS, hostnames, form, "networkFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Appliance",
+                       "Remote Host",
+                       "Remote Port",
+                       "Success",
+                       "True"]
+    with span("assert"):
+        verify(driver, panes={NETWORK_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(NETWORK_RESULTS))
@@ -0,0 +1,74 @@
+"""Sanity checks of the MAST web page and the status charts."""
+import logging
+
+import selenium
+
+from mast_tests import locators
+from mast_tests import monitor
+from mast_tests.monitor import start_charting
+from mast_tests.runner import test
+from mast_tests.waits import wait_for_element_by_id
+
+log = logging.getLogger(__name__)
+
+
+##########################################
+# Test 1: Sanity check for page title
+##########################################
+@test()
+def page_title(driver):
+    log.info("Testing page title")
+    expected_text = "M.A.S.T. for DP"
+    if expected_text not in driver.title:
+        raise AssertionError('Page title not valid! expected "{}", got '
+                             '"{}"'.format(expected_text, driver.title))
+    log.info("Page title valid.")
+
+
+######################################
+# test 2: All tabs should be there
+######################################
+@test()
+def all_tabs(driver):
+    tabs = [
+        "accounts",
+        "backups",
+        "crypto",
+        "deployment",
+        "developer",
+        "network",
+        "ssh",
+        "status",
+        "system"
+    ]
+    missing = []
+    for tab in tabs:
+        try:
+            driver.find_element(*locators.tab(tab))
+            log.info("Found tab {}.".format(tab))
+        except selenium.common.exceptions.NoSuchElementException:
+            log.error("tab {} not found!".format(tab))
+            missing.append(tab)
+    if missing:
+        raise AssertionError("Tabs not found: {}".format(", ".join(missing)))
+
+
+#######################
+# test 3: status tab
+#######################
+@test(tab="status")
+def status_tab(driver):
+    start_charting(driver)
+
+    missing = []
+    for pane in [monitor.pane(metric) for metric in monitor.METRICS]:
+        try:
+            wait_for_element_by_id(driver, pane)
+            log.info("Pane {} exists.".format(pane))
+        except selenium.common.exceptions.TimeoutException:
+            log.error("Pane {} does not exist!".format(pane))
+            missing.append(pane)
+    if missing:
+        raise AssertionError("Panes not found: {}".format(", ".join(missing)))
+    # Whether the charts keep running for the entire run is checked by the
+    # chart monitor (see mast_tests.monitor) in a session of its own
@@ -0,0 +1,59 @@
+"""Tests for the ssh tab."""
+import logging
+
+from mast_tests import locators
+from mast_tests.extract import missing_texts
+from mast_tests.locators import find
+from mast_tests.report import span
+from mast_tests.runner import test
+from mast_tests.sshsession import run_session
+
+log = logging.getLogger(__name__)
+
+
+################################
+# Test 22: ssh
+################################
+# The directory it makes lives in the demo domain and goes with it
+@test(tab="ssh", reads=["domain:demo"])
+def ssh(driver, hostnames, names, ssh_config):
+    log.debug("Testing ssh")
+    find(driver, locators.tab("ssh")).click()
+
+    ssh_commands = [
+        "show clock",
+        "config",
+        "switch domain {}".format(names.domain),
+        "dir local:///ondisk/",
+        "mkdir {}".format(names.directory),
+        "switch domain default",
+        "exit",
+        "exit"
+    ]
+    # Commands are sent without waiting for each other, every appliance's
+    # transcript is followed on its own and an appliance rejecting a
+    # command fails the test straight away
+    outputs = run_session(driver, hostnames, ssh_commands,
+                          until=["Goodbye."], depth=ssh_config.get("depth"))
+
+    log.debug("Found results. Testing")
+    expected_texts = [
+        "show clock",
+        "config",
+        "switch domain {}".format(names.domain),
+        "dir local:///ondisk/",
+        "mkdir {}".format(names.directory),
+        "switch domain default",
+        "exit",
+        "Goodbye."
+    ]
+    with span("assert"):
+        missing = missing_texts(outputs, dict(
+            (hostname, expected_texts) for hostname in hostnames
+        ))
+    if missing:
+        raise AssertionError("Expected text not found: {}".format(
+            "; ".join("{!r} from {}".format(text, hostname)
+                      for hostname, text in missing)
+        ))
+    log.info("All expected text was found in results")
@@ -0,0 +1,305 @@
+"""Tests for the system tab."""
+import logging
+
+from mast_tests import locators
+from mast_tests import waits
+from mast_tests.extract import verify
+from mast_tests.forms import fill, set_checkboxes
+from mast_tests.locators import find
+from mast_tests.report import span
+from mast_tests.runner import test
+from mast_tests.waits import (
+    wait_for,
+    element_visible,
+    results_closed,
+    results_ready,
+)
+
+log = logging.getLogger(__name__)
+
+SYSTEM_RESULTS = locators.results("system")
+
+
+###################################################
+# test 4: system -> get status -> DateTimeStatus
+###################################################
+@test(tab="system")
+def get_status(driver, hostnames):
+    log.debug("Testing system -> get status -> DateTimeStatus")
+    find(driver, locators.tab("system")).click()
+    find(driver, locators.action("get status")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("get_status")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "StatusProvider": ["DateTimeStatus"],
+        "Domain": "default",
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("systemFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(SYSTEM_RESULTS, hostnames, form, "systemFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    with span("assert"):
+        verify(driver, panes={SYSTEM_RESULTS: hostnames})
+    log.info("all hostnames were found in output")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(SYSTEM_RESULTS))
+
+
+#########################
+# Test 5: List domains
+#########################
+@test(tab="system")
+def list_domains(driver, hostnames):
+    log.info("Testing system -> list domains")
+    find(driver, locators.tab("system")).click()
+    find(driver, locators.action("list domains")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("list_domains")))
+
+    log.debug("Selecting no-check-hostname")
+    fill(driver, form, {"no_check_hostname": True})
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("systemFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(SYSTEM_RESULTS, hostnames, form, "systemFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["All", "default"]
+    with span("assert"):
+        verify(driver, panes={SYSTEM_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(SYSTEM_RESULTS))
+
+
+########################
+# Test 6: Add domain
+########################
+@test(tab="system", creates=["domain:demo"])
+def add_domain(driver, hostnames, names):
+    log.info("Testing system -> add domain")
+    find(driver, locators.tab("system")).click()
+    find(driver, locators.action("add domain")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("add_domain")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "domain_name": names.domain,
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("systemFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(SYSTEM_RESULTS, hostnames, form, "systemFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Succeeded"]
+    with span("assert"):
+        verify(driver, panes={SYSTEM_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(SYSTEM_RESULTS))
+
+
+#########################
+# Test 7: List domains
+#########################
+@test(tab="system", reads=["domain:demo"])
+def list_domains_demo(driver, hostnames, names):
+    log.info("Testing system -> list domains (looking for domain {} which "
+             "should have been added)".format(names.domain))
+    find(driver, locators.tab("system")).click()
+    find(driver, locators.action("list domains")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("list_domains")))
+
+    log.debug("Selecting no-check-hostname")
+    fill(driver, form, {"no_check_hostname": True})
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("systemFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(SYSTEM_RESULTS, hostnames, form, "systemFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["All", "default", names.domain]
+    with span("assert"):
+        verify(driver, panes={SYSTEM_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(SYSTEM_RESULTS))
+
+
+##########################
+# Test 8: get filestore
+##########################
+# Lists temporary:, which clean up empties
+@test(tab="system", reads=["files:temporary"])
+def get_filestore(driver, hostnames):
+    log.info("Testing system -> get filestore")
+    find(driver, locators.tab("system")).click()
+    find(driver, locators.action("get filestore")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("get_filestore")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "Domain": "default",
+        "location": "pubcert:",
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("systemFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(SYSTEM_RESULTS, hostnames, form, "systemFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["See Download"]
+    with span("assert"):
+        verify(driver, panes={SYSTEM_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(SYSTEM_RESULTS))
+
+
+##########################
+# Test 9: cleanup
+##########################
+@test(tab="system", destroys=["files:temporary"])
+def clean_up(driver, hostnames):
+    log.info("Testing system -> clean up")
+    find(driver, locators.tab("system")).click()
+    find(driver, locators.action("clean up")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("clean_up")))
+
+    log.debug("Checking every checkbox")
+    set_checkboxes(driver, form)
+
+    log.debug("Selecting default domain")
+    fill(driver, form, {"Domain": "default"})
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("systemFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(SYSTEM_RESULTS, hostnames, form, "systemFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+
+    expected_texts = list(hostnames)
+    expected_texts += [
+        "chkpoints:/",
+        "export:/",
+        "logtemp:/",
+        "logstore:/",
+        "ErrorReports",
+        "Cleaned"
+    ]
+    with span("assert"):
+        verify(driver, panes={SYSTEM_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(SYSTEM_RESULTS))
+
+
+##########################
+# Test 23: del domain
+##########################
+@test(tab="system", destroys=["domain:demo"])
+def del_domain(driver, hostnames, names):
+    log.info("Testing system -> del domain")
+    find(driver, locators.tab("system")).click()
+    find(driver, locators.action("del domain")).click()
+
+    log.debug("Finding form")
+    form = wait_for(driver, element_visible(locators.form("del_domain")))
+
+    log.debug("Filling in form")
+    fill(driver, form, {
+        "Domain": names.domain,
+        "save_config": True,
+        "no_check_hostname": True,
+    })
+
+    log.debug("Submitting form")
+    with span("submit"):
+        form.find_element_by_id("systemFormSubmit").click()
+
+    log.debug("Form submitted, waiting at most {} seconds for results to appear".format(waits.default_timeout))
+    results = wait_for(
+        driver,
+        results_ready(SYSTEM_RESULTS, hostnames, form, "systemFormSubmit")
+    )
+
+    log.debug("Found results. Testing")
+    expected_texts = list(hostnames)
+    expected_texts += ["Succeeded"]
+    with span("assert"):
+        verify(driver, panes={SYSTEM_RESULTS: expected_texts})
+    log.info("All expected text was found in results")
+
+    log.debug("closing output table")
+    results.find_element_by_class_name("output_close").click()
+    wait_for(driver, results_closed(SYSTEM_RESULTS))
@@ -0,0 +1,209 @@
+"""Event-driven waits for the MAST web UI.
+
+Conditions are callables taking a driver and returning a truthy value once
+they are satisfied. They compose with ``&`` and ``|`` which behave like
+Python's ``and`` and ``or``: ``a & b`` yields the value of ``b`` once both
+hold, ``a | b`` yields the first truthy value.
+"""
+import logging
+from time import time, sleep
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+
+from mast_tests import policy
+from mast_tests.extract import css_selector
+from mast_tests.report import recorder
+
+log = logging.getLogger(__name__)
+
+# Used when wait_for is not given an explicit timeout, the runner sets this
+# from the "timeout" key in config.json
+default_timeout = 30
+
+# Polling starts fast and backs off towards max_interval so quick responses
+# are noticed quickly while slow ones don't hammer the browser
+initial_interval = 0.05
+max_interval = 1.0
+backoff = 1.5
+
+# CSS selector for the "working" indicator shown while MAST web is waiting
+# on the appliances
+SPINNER = ".loading"
+
+# Whether a spinner is showing, whether the form's submit button (if any)
+# is enabled and the results pane with its text, for results_ready
+RESULTS_STATE_SCRIPT = """
+var spinner = arguments[0], pane = document.querySelector(arguments[1]);
+var form = arguments[2], buttonId = arguments[3];
+var busy = Array.prototype.some.call(
+    document.querySelectorAll(spinner),
+    function (elem) { return elem.getClientRects().length > 0; }
+);
+var enabled = true;
+if (form) {
+    var button = form.querySelector("[id='" + buttonId + "']");
+    enabled = !!button && !button.disabled;
+}
+return {busy: busy, enabled: enabled, pane: pane,
+        text: pane ? pane.innerText : null};
+"""
+
+
+class Condition(object):
+    def __init__(self, func, description):
+        self.func = func
+        self.description = description
+
+    def __call__(self, driver):
+        try:
+            return self.func(driver)
+        except (NoSuchElementException, StaleElementReferenceException):
+            return None
+
+    def __and__(self, other):
+        return all_of(self, other)
+
+    def __or__(self, other):
+        return any_of(self, other)
+
+    def __repr__(self):
+        return "<Condition {}>".format(self.description)
+
+
+def all_of(*conditions):
+    def check(driver):
+        value = None
+        for condition in conditions:
+            value = condition(driver)
+            if not value:
+                return value
+        return value
+    return Condition(
+        check, " and ".join(c.description for c in conditions)
+    )
+
+
+def any_of(*conditions):
+    def check(driver):
+        value = None
+        for condition in conditions:
+            value = condition(driver)
+            if value:
+                return value
+        return value
+    return Condition(
+        check, " or ".join(c.description for c in conditions)
+    )
+
+
+def wait_for(driver, condition, timeout=None, description=None,
+             appliance=None):
+    """Poll condition with backoff until it is truthy and return its value.
+
+    Raises TimeoutException if timeout seconds pass first, the timeout is
+    cut short if the test's budget (see ``mast_tests.policy``) runs out
+    sooner. Either way the wait is recorded as a span of the current test,
+    attributed to appliance if one is given.
+    """
+    if timeout is None:
+        timeout = default_timeout
+    timeout = policy.cap(timeout)
+    if description is None:
+        description = condition.description
+    start = time()
+    interval = initial_interval
+    while True:
+        value = condition(driver)
+        elapsed = time() - start
+        if value:
+            recorder.add("wait for " + description, elapsed, appliance)
+            log.debug("Waited {:.3f}s for {}".format(elapsed, description))
+            return value
+        if elapsed >= timeout:
+            log.error("Timed out after {:.3f}s waiting for {}".format(
+                elapsed, description
+            ))
+            recorder.add("wait for " + description, elapsed, appliance,
+                         "TimeoutException")
+            raise TimeoutException(
+                "Timed out after {}s waiting for {}".format(
+                    timeout, description
+                )
+            )
+        sleep(min(interval, timeout - elapsed))
+        interval = min(interval * backoff, max_interval)
+
+
+def wait_for_element_by_id(driver, _id, timeout=None):
+    return wait_for(driver, element_present((By.ID, _id)), timeout=timeout)
+
+
+##############################################################################
+# Conditions
+##############################################################################
+
+def element_present(locator):
+    return Condition(
+        lambda driver: driver.find_element(*locator),
+        "element {}".format(locator[1])
+    )
+
+
+def element_visible(locator):
+    def check(driver):
+        elem = driver.find_element(*locator)
+        return elem if elem.is_displayed() else None
+    return Condition(check, "visible element {}".format(locator[1]))
+
+
+def results_closed(locator):
+    def check(driver):
+        for elem in driver.find_elements(*locator):
+            try:
+                if elem.is_displayed():
+                    return False
+            except StaleElementReferenceException:
+                pass
+        return True
+    return Condition(check, "{} closed".format(locator[1]))
+
+
+def results_ready(locator, hostnames, form=None, button_id=None, texts=()):
+    """Results pane at locator is showing every one of hostnames and texts
+    and MAST web has finished working on the request. Yields the results
+    element.
+
+    Each poll reads the spinner, the form's button and the pane's text in
+    one script. The time each hostname first shows up, counted from when
+    the condition is created, is recorded as a "response" span for that
+    appliance.
+    """
+    selector = css_selector(locator)
+    hostnames = list(hostnames)
+    texts = list(texts)
+    start = time()
+    seen = set()
+
+    def check(driver):
+        state = driver.execute_script(
+            RESULTS_STATE_SCRIPT, SPINNER, selector, form, button_id
+        )
+        text = state["text"] or ""
+        for hostname in hostnames:
+            if hostname not in seen and hostname in text:
+                seen.add(hostname)
+                recorder.add("response", time() - start, hostname)
+        if state["busy"] or not state["enabled"]:
+            return None
+        if not text.strip() or len(seen) < len(hostnames) or \
+                not all(t in text for t in texts):
+            return None
+        return state["pane"]
+    return Condition(check, "{} in {}".format(
+        ", ".join(hostnames + texts) or "results", locator[1]
+    ))